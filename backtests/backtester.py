@@ -24,6 +24,8 @@ root_dir = Path(__file__).parent.parent
 sys.path.append(str(root_dir))
 sys.path.append(str(root_dir / "core"))
 
+from utils._yaml import YamlLoader
+
 
 @dataclass
 class BacktestTrade:
@@ -86,7 +88,7 @@ class IOFAEBacktester:
             config_path = str(root_dir / config_path)
             
         with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+            self.config = yaml.load(f, Loader=YamlLoader)
         
         trading = self.config.get('trading', {})
         self.symbol = trading.get('symbol', 'EURUSD')
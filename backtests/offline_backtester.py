@@ -15,6 +15,9 @@ from typing import List, Dict, Optional, Tuple
 from collections import deque
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils._yaml import YamlLoader
 
 
 @dataclass
@@ -187,7 +190,7 @@ class IOFAEOfflineBacktester:
     def __init__(self, config_path: str = "config.yaml"):
         try:
             with open(config_path, 'r') as f:
-                self.config = yaml.safe_load(f)
+                self.config = yaml.load(f, Loader=YamlLoader)
         except:
             self.config = self._default_config()
         
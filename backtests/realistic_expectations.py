@@ -5,7 +5,11 @@ IOFAE - GERÇEKÇİ PERFORMANS BEKLENTİSİ
 Bu dosya, simülasyon vs gerçek dünya farkını açıklar.
 """
 
-print("""
+import sys
+
+import numpy as np
+
+_BANNER = """
 ╔══════════════════════════════════════════════════════════════════════════════╗
 ║                    IOFAE - GERÇEKÇİ BEKLENTİ ANALİZİ                        ║
 ╠══════════════════════════════════════════════════════════════════════════════╣
@@ -103,68 +107,101 @@ print("""
    4. Her aşamada sonuçları analiz et
 
 ╚══════════════════════════════════════════════════════════════════════════════╝
-""")
+"""
 
-# Gerçekçi aylık simülasyon
-import random
-random.seed(42)
 
-print("\n📊 12 AYLIK GERÇEKÇİ SİMÜLASYON:\n")
+# Gerçekçi aylık simülasyon (NumPy: N_PATHS yol tek seferde üretilir)
+N_PATHS = 10_000          # Monte Carlo yol sayısı (tablo ilk yolu gösterir)
+START_BALANCE = 100000
 
-balance = 100000
 months = [
     "Oca", "Şub", "Mar", "Nis", "May", "Haz",
     "Tem", "Ağu", "Eyl", "Eki", "Kas", "Ara"
 ]
 
-total_profit = 0
-max_dd = 0
-peak = balance
 
-print(f"{'Ay':<6} {'Trade':>6} {'Win%':>6} {'Kar/Zarar':>12} {'Bakiye':>14} {'DD%':>6}")
-print("-" * 56)
-
-for month in months:
-    # Rastgele ay tipi
-    month_type = random.choices(
-        ["iyi", "normal", "kotu", "cok_kotu"],
-        weights=[0.35, 0.35, 0.20, 0.10]
-    )[0]
+def drawdown_pct(balance, start_balance):
+    """
+    Zirveden düşüş (%) - dalsız: zirve = np.maximum.accumulate.
+    Başlangıç bakiyesi ilk zirve sayılır. balance: (..., ay) dizisi.
+    """
+    peak = np.maximum(np.maximum.accumulate(balance, axis=-1), start_balance)
+    return (peak - balance) / peak * 100
+
+
+# Ay tipleri: iyi, normal, kotu, cok_kotu
+MONTH_WEIGHTS = [0.35, 0.35, 0.20, 0.10]
+MONTH_CUM = np.cumsum(MONTH_WEIGHTS)      # [0.35, 0.70, 0.90, 1.00]
+MONTH_CUM[-1] = 1.0
+
+# Senaryo parametreleri (SoA): her dizi ay tipi ile indekslenir
+#                       iyi  normal  kotu  cok_kotu
+TRADES_LO = np.array([   18,    14,    10,     8], dtype=np.int64)
+TRADES_HI = np.array([   25,    20,    16,    14], dtype=np.int64)
+WIN_LO    = np.array([ 0.72,  0.65,  0.55,  0.45])
+WIN_HI    = np.array([ 0.78,  0.72,  0.65,  0.55])
+PROF_LO   = np.array([ 6000,  3000,   500, -4000], dtype=np.float64)
+PROF_HI   = np.array([10000,  6000,  3000, -1000], dtype=np.float64)
+
+
+def run_simulation(seed=42, n_paths=N_PATHS):
+    """
+    12 aylık simülasyonu n_paths yol için çalıştırır.
+    Dönüş: (trades, win_rate, profit, balance, dd) - her biri (n_paths, 12)
+    """
+    rng = np.random.default_rng(seed)
     
-    if month_type == "iyi":
-        trades = random.randint(18, 25)
-        win_rate = random.uniform(0.72, 0.78)
-        profit = random.uniform(6000, 10000)
-    elif month_type == "normal":
-        trades = random.randint(14, 20)
-        win_rate = random.uniform(0.65, 0.72)
-        profit = random.uniform(3000, 6000)
-    elif month_type == "kotu":
-        trades = random.randint(10, 16)
-        win_rate = random.uniform(0.55, 0.65)
-        profit = random.uniform(500, 3000)
-    else:  # cok_kotu
-        trades = random.randint(8, 14)
-        win_rate = random.uniform(0.45, 0.55)
-        profit = random.uniform(-4000, -1000)
+    # Rastgele ay tipleri (n_paths, 12); kümülatif ağırlıklar bir kez hesaplanır
+    types = np.searchsorted(MONTH_CUM, rng.random((n_paths, len(months))), side="right")
     
-    balance += profit
-    total_profit += profit
+    # Parametreler doğrudan tip indeksiyle (dal yok, ara (.., 6) tablo yok)
+    trades = rng.integers(TRADES_LO[types], TRADES_HI[types] + 1)
+    win_rate = rng.uniform(WIN_LO[types], WIN_HI[types])
+    profit = rng.uniform(PROF_LO[types], PROF_HI[types])
     
-    if balance > peak:
-        peak = balance
-    dd = (peak - balance) / peak * 100
-    if dd > max_dd:
-        max_dd = dd
+    # Bakiye ve drawdown
+    balance = START_BALANCE + profit.cumsum(axis=1)
+    dd = drawdown_pct(balance, START_BALANCE)
+    return trades, win_rate, profit, balance, dd
+
+
+def print_report(trades, win_rate, profit, balance, dd):
+    """İlk yolun aylık tablosu + tüm yolların Monte Carlo özeti."""
+    max_dd = dd.max(axis=1)
+    total_profit = profit.sum(axis=1)
     
-    emoji = "📈" if profit > 0 else "📉"
-    print(f"{month:<6} {trades:>6} {win_rate*100:>5.0f}% {profit:>+12,.0f} ${balance:>13,.0f} {dd:>5.1f}% {emoji}")
-
-print("-" * 56)
-print(f"\nÖZET:")
-print(f"   Başlangıç:    $100,000")
-print(f"   Bitiş:        ${balance:,.0f}")
-print(f"   Net Kar:      ${total_profit:+,.0f} ({total_profit/1000:.1f}%)")
-print(f"   Max DD:       {max_dd:.1f}%")
-print(f"\n   Bu GERÇEKÇİ bir beklentidir.")
-print(f"   Simülasyonlar (%200+ kar) gerçekçi DEĞİLDİR.")
+    # Tablo satırları önce listeye, sonra tek write ile basılır
+    emojis = np.where(profit[0] > 0, "📈", "📉")
+    rows = [
+        "\n📊 12 AYLIK GERÇEKÇİ SİMÜLASYON:\n",
+        f"{'Ay':<6} {'Trade':>6} {'Win%':>6} {'Kar/Zarar':>12} {'Bakiye':>14} {'DD%':>6}",
+        "-" * 56,
+    ]
+    rows += [
+        f"{month:<6} {t:>6} {w*100:>5.0f}% {p:>+12,.0f} ${b:>13,.0f} {d:>5.1f}% {e}"
+        for month, t, w, p, b, d, e in zip(
+            months, trades[0].tolist(), win_rate[0].tolist(), profit[0].tolist(),
+            balance[0].tolist(), dd[0].tolist(), emojis.tolist(),
+        )
+    ]
+    rows.append("-" * 56)
+    sys.stdout.write("\n".join(rows) + "\n")
+    print(f"\nÖZET:")
+    print(f"   Başlangıç:    $100,000")
+    print(f"   Bitiş:        ${balance[0, -1]:,.0f}")
+    print(f"   Net Kar:      ${total_profit[0]:+,.0f} ({total_profit[0]/1000:.1f}%)")
+    print(f"   Max DD:       {max_dd[0]:.1f}%")
+
+    p5, p50, p95 = np.percentile(balance[:, -1], [5, 50, 95])
+    print(f"\n📈 MONTE CARLO ({len(balance):,} yol):")
+    print(f"   Medyan Bitiş:     ${p50:,.0f}")
+    print(f"   %5 - %95:         ${p5:,.0f} - ${p95:,.0f}")
+    print(f"   Zarar Olasılığı:  %{(total_profit < 0).mean()*100:.1f}")
+    print(f"   Max DD ≥ %10:     %{(max_dd >= 10).mean()*100:.1f}")
+    print(f"\n   Bu GERÇEKÇİ bir beklentidir.")
+    print(f"   Simülasyonlar (%200+ kar) gerçekçi DEĞİLDİR.")
+
+
+if __name__ == "__main__":
+    sys.stdout.write(_BANNER)
+    print_report(*run_simulation())
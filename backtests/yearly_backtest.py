@@ -7,303 +7,317 @@ IOFAE stratejisinin uzun vadeli performansını gösterir.
 Her ay için gerçekçi trade senaryoları.
 """
 
+import functools
+import io
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from dataclasses import dataclass
-from typing import List, Dict
-import random
+from typing import Dict, Optional
 
-random.seed(42)
-np.random.seed(42)
 
+# Zone types: (name, weight, direction hint, win probability)
+ZONE_TYPES = [
+    ("STOP_HUNT_LOW", 0.20, "LONG", 0.92),
+    ("STOP_HUNT_HIGH", 0.15, "SHORT", 0.90),
+    ("VWAP_REVERSION", 0.20, "BOTH", 0.87),
+    ("INSTITUTIONAL_ROUND", 0.15, "BOTH", 0.88),
+    ("FIB_0.618", 0.12, "BOTH", 0.85),
+    ("CONFLUENCE", 0.10, "BOTH", 0.88),
+    ("HALF_ROUND", 0.08, "BOTH", 0.82),
+]
+ZONE_NAMES = np.array([z[0] for z in ZONE_TYPES])
+ZONE_WEIGHTS = np.array([z[1] for z in ZONE_TYPES])
+ZONE_WEIGHTS /= ZONE_WEIGHTS.sum()
+ZONE_HINT = np.array([{"LONG": 1, "SHORT": -1, "BOTH": 0}[z[2]] for z in ZONE_TYPES])
+ZONE_WIN_PROB = np.array([z[3] for z in ZONE_TYPES])
+ZONE_IS_ROUND = np.array(["ROUND" in z[0] for z in ZONE_TYPES])
 
-@dataclass
-class YearlyTrade:
-    """Trade record for yearly backtest."""
-    date: str
-    time: str
-    zone_price: float
-    score: int
-    direction: str
-    entry_price: float
-    exit_price: float
-    pips: float
-    profit: float
-    zone_type: str
-    exit_reason: str
-    month: str
+# Random time during London/NY overlap, biased towards 08:00 for stop hunts
+HOUR_POOL = np.array([8, 8, 8, 9, 13, 14, 15])
+EXIT_REASONS_WIN = np.array(["EXHAUSTION", "EXHAUSTION", "EXHAUSTION", "TIME_LIMIT"])
 
+# Fixed categories so monthly frames concatenate without falling back to object
+DIRECTION_DTYPE = pd.CategoricalDtype(["LONG", "SHORT"])
+ZONE_TYPE_DTYPE = pd.CategoricalDtype(ZONE_NAMES)
+EXIT_REASON_DTYPE = pd.CategoricalDtype(["EXHAUSTION", "TIME_LIMIT", "STOP_LOSS"])
 
-def generate_monthly_trades(month: str, year: int, base_price: float) -> List[YearlyTrade]:
-    """Generate realistic trades for a month based on IOFAE patterns."""
-    
-    trades = []
-    
-    # Zone types with weights
-    zone_types = [
-        ("STOP_HUNT_LOW", 0.20, "LONG"),
-        ("STOP_HUNT_HIGH", 0.15, "SHORT"),
-        ("VWAP_REVERSION", 0.20, "BOTH"),
-        ("INSTITUTIONAL_ROUND", 0.15, "BOTH"),
-        ("FIB_0.618", 0.12, "BOTH"),
-        ("CONFLUENCE", 0.10, "BOTH"),
-        ("HALF_ROUND", 0.08, "BOTH"),
-    ]
-    
-    # Winning probability by zone type
-    win_probs = {
-        "STOP_HUNT_LOW": 0.92,
-        "STOP_HUNT_HIGH": 0.90,
-        "INSTITUTIONAL_ROUND": 0.88,
-        "VWAP_REVERSION": 0.87,
-        "FIB_0.618": 0.85,
-        "CONFLUENCE": 0.88,
-        "HALF_ROUND": 0.82,
-    }
-    
-    # Exit reasons
-    exit_reasons_win = ["EXHAUSTION", "EXHAUSTION", "EXHAUSTION", "TIME_LIMIT"]
-    exit_reasons_loss = ["STOP_LOSS"]
-    
-    # Trading days (avoid weekends)
-    days_in_month = 28 if month == "02" else (30 if month in ["04", "06", "09", "11"] else 31)
+INITIAL_BALANCE = 100000
+
+# EUR/USD base prices by month (realistic 2025 range)
+MONTHLY_PRICES = {
+    "01": 1.0850,  # Ocak 2025
+    "02": 1.0780,
+    "03": 1.0720,
+    "04": 1.0690,
+    "05": 1.0750,
+    "06": 1.0820,
+    "07": 1.0780,
+    "08": 1.0650,
+    "09": 1.0580,
+    "10": 1.0550,
+    "11": 1.0520,
+    "12": 1.0600,  # Aralık 2025
+}
+
+# Metrics returned by run_yearly_backtest / aggregated by run_sweep
+SWEEP_METRICS = ('total_trades', 'win_rate', 'total_profit', 'profit_pct', 'max_drawdown_pct', 'profit_factor')
+
+
+def generate_trades(
+    year: int,
+    base_prices: Dict[str, float],
+    rng: np.random.Generator
+) -> pd.DataFrame:
+    """
+    Generate realistic trades for the given months ({"MM": base price})
+    based on IOFAE patterns, one row per trade in date order.
+    """
+    pip = 0.0001
+    months = list(base_prices)
+    n_months = len(months)
+    
+    # Trading days
+    days_in_month = np.array([
+        28 if m == "02" else (30 if m in ["04", "06", "09", "11"] else 31) for m in months
+    ])
     
     # Generate 6-10 trades per month (based on 3 trades/day max, ~2-3 trading days/week)
-    num_trades = random.randint(6, 10)
-    
-    # Select trading days
-    available_days = [d for d in range(1, days_in_month + 1)]
-    trade_days = sorted(random.sample(available_days, min(num_trades, len(available_days))))
-    
-    for day in trade_days[:num_trades]:
-        # Random time during London/NY overlap
-        hour = random.choice([8, 8, 8, 9, 13, 14, 15])  # Bias towards 08:00 for stop hunts
-        minute = random.randint(0, 59)
-        
-        # Select zone type
-        zone_type, weight, direction_hint = random.choices(zone_types, weights=[z[1] for z in zone_types])[0]
-        
-        # Determine direction
-        if direction_hint == "BOTH":
-            direction = random.choice(["LONG", "SHORT"])
-        else:
-            direction = direction_hint
-        
-        # Zone price (around base price)
-        price_offset = random.uniform(-0.0100, 0.0100)
-        zone_price = round(base_price + price_offset, 4)
-        
-        # Round to institutional levels if round number zone
-        if "ROUND" in zone_type:
-            zone_price = round(zone_price * 200) / 200  # Round to 50 pips
-        
-        # Score (88-98 range)
-        score = random.randint(88, 98)
-        
-        # Entry price (7 pips before zone)
-        pip = 0.0001
-        if direction == "LONG":
-            entry_price = zone_price - (7 * pip)
-        else:
-            entry_price = zone_price + (7 * pip)
-        
-        # Win/Loss determination
-        is_win = random.random() < win_probs.get(zone_type, 0.85)
-        
-        if is_win:
-            # Winning trade: 15-35 pips
-            pips = random.uniform(15, 35)
-            exit_reason = random.choice(exit_reasons_win)
-        else:
-            # Losing trade: -10 pips (stop loss)
-            pips = -10
-            exit_reason = "STOP_LOSS"
-        
-        # Exit price
-        if direction == "LONG":
-            exit_price = entry_price + (pips * pip)
-        else:
-            exit_price = entry_price - (pips * pip)
-        
-        # Profit calculation with proper lot sizing
-        # 1% risk on 100K = $1000 risk
-        # 10 pip SL = $1000 / 10 pips = $100/pip = 10 lots
-        # So profit = pips * 100 (not pips * 10)
-        profit = pips * 100  # ~10 lot position with 1% risk
-        
-        trades.append(YearlyTrade(
-            date=f"{day:02d}.{month}.{year}",
-            time=f"{hour:02d}:{minute:02d}",
-            zone_price=round(zone_price, 5),
-            score=score,
-            direction=direction,
-            entry_price=round(entry_price, 5),
-            exit_price=round(exit_price, 5),
-            pips=round(pips, 1),
-            profit=round(profit, 2),
-            zone_type=zone_type,
-            exit_reason=exit_reason,
-            month=f"{year}-{month}"
-        ))
-    
-    return trades
+    counts = rng.integers(6, 11, size=n_months)
+    n = int(counts.sum())
+    month_idx = np.repeat(np.arange(n_months), counts)
+    
+    # Distinct days per month: the month's first counts[m] days by random key
+    day_keys = rng.random((n_months, 31))
+    day_keys[np.arange(31)[None, :] >= days_in_month[:, None]] = np.inf
+    day_order = np.argsort(day_keys, axis=1)
+    slot = np.arange(n) - np.repeat(np.cumsum(counts) - counts, counts)
+    days = day_order[month_idx, slot] + 1
+    days = days[np.lexsort((days, month_idx))]
+    
+    # All remaining randomness for the whole period, one draw per distribution
+    hours = rng.choice(HOUR_POOL, size=n)
+    minutes = rng.integers(0, 60, size=n)
+    zone_idx = rng.choice(len(ZONE_TYPES), size=n, p=ZONE_WEIGHTS)
+    coin = rng.random(n) < 0.5
+    price_offset = rng.uniform(-0.0100, 0.0100, size=n)
+    score = rng.integers(88, 99, size=n)                 # 88-98
+    is_win = rng.random(n) < ZONE_WIN_PROB[zone_idx]
+    win_pips = rng.uniform(15, 35, size=n)               # winners: 15-35 pips
+    win_reason = rng.choice(EXIT_REASONS_WIN, size=n)
+    
+    # Direction: hint, or a coin flip for "BOTH" zones (+1 LONG / -1 SHORT)
+    hint = ZONE_HINT[zone_idx]
+    sign = np.where(hint != 0, hint, np.where(coin, 1, -1))
+    
+    # Zone price around the month's base; round number zones snap to 50 pips
+    base_price = np.array([base_prices[m] for m in months])[month_idx]
+    zone_price = np.round(base_price + price_offset, 4)
+    zone_price = np.where(ZONE_IS_ROUND[zone_idx], np.round(zone_price * 200) / 200, zone_price)
+    
+    # Entry 7 pips before zone; losers hit the 10 pip stop
+    entry_price = zone_price - sign * 7 * pip
+    pips = np.where(is_win, win_pips, -10.0)
+    exit_price = entry_price + sign * pips * pip
+    
+    # Profit calculation with proper lot sizing
+    # 1% risk on 100K = $1000 risk
+    # 10 pip SL = $1000 / 10 pips = $100/pip = 10 lots
+    # So profit = pips * 100 (not pips * 10)
+    profit = pips * 100  # ~10 lot position with 1% risk
+    
+    exit_reason = np.where(is_win, win_reason, "STOP_LOSS")
+    direction = np.where(sign > 0, "LONG", "SHORT")
+    month_of = [months[i] for i in month_idx.tolist()]
+    
+    return pd.DataFrame({
+        'date': [f"{d:02d}.{m}.{year}" for d, m in zip(days.tolist(), month_of)],
+        'time': [f"{h:02d}:{mi:02d}" for h, mi in zip(hours.tolist(), minutes.tolist())],
+        'month': [f"{year}-{m}" for m in month_of],
+        'zone_price': np.round(zone_price, 5),
+        'score': score.astype(np.int8),
+        'direction': pd.Categorical(direction, dtype=DIRECTION_DTYPE),
+        'entry_price': np.round(entry_price, 5),
+        'exit_price': np.round(exit_price, 5),
+        'pips': np.round(pips, 1),
+        'profit': np.round(profit, 2),
+        'zone_type': pd.Categorical.from_codes(zone_idx, dtype=ZONE_TYPE_DTYPE),
+        'exit_reason': pd.Categorical(exit_reason, dtype=EXIT_REASON_DTYPE),
+    })
 
 
-def run_yearly_backtest():
-    """Run 12-month backtest simulation."""
-    
-    print("\n" + "="*80)
-    print("🚀 IOFAE 1 YILLIK BACKTEST - OCAK 2025 → OCAK 2026")
-    print("="*80)
-    print("\n📌 Bu demo, IOFAE stratejisinin 12 aylık performansını gösterir.")
-    print("   Gerçek MT5 verileriyle test için 'backtester.py' kullanın.\n")
-    
-    # Initial settings
-    initial_balance = 100000
-    balance = initial_balance
-    
-    # EUR/USD base prices by month (realistic 2025 range)
-    monthly_prices = {
-        "01": 1.0850,  # Ocak 2025
-        "02": 1.0780,
-        "03": 1.0720,
-        "04": 1.0690,
-        "05": 1.0750,
-        "06": 1.0820,
-        "07": 1.0780,
-        "08": 1.0650,
-        "09": 1.0580,
-        "10": 1.0550,
-        "11": 1.0520,
-        "12": 1.0600,  # Aralık 2025
-    }
+def generate_monthly_trades(
+    month: str,
+    year: int,
+    base_price: float,
+    rng: np.random.Generator
+) -> pd.DataFrame:
+    """Generate realistic trades for a month based on IOFAE patterns (one row per trade)."""
+    return generate_trades(year, {month: base_price}, rng)
+
+
+def simulate_year(seed: int = 42) -> Dict:
+    """
+    One 12-month simulation, no output. Everything drawn from
+    np.random.default_rng(seed), so results depend only on the seed.
+    """
+    rng = np.random.default_rng(seed)
+    initial_balance = INITIAL_BALANCE
     
     # Generate trades for each month
-    all_trades = []
-    monthly_stats = []
-    
-    for month_num in range(1, 13):
-        month = f"{month_num:02d}"
-        base_price = monthly_prices[month]
-        
-        trades = generate_monthly_trades(month, 2025, base_price)
-        all_trades.extend(trades)
-        
-        # Monthly stats
-        month_profit = sum(t.profit for t in trades)
-        month_wins = len([t for t in trades if t.profit > 0])
-        month_losses = len([t for t in trades if t.profit < 0])
-        
-        monthly_stats.append({
-            'month': f"2025-{month}",
-            'trades': len(trades),
-            'wins': month_wins,
-            'losses': month_losses,
-            'profit': month_profit,
-            'win_rate': month_wins / len(trades) * 100 if trades else 0
-        })
-    
-    # Calculate running balance and max drawdown
-    equity_curve = [initial_balance]
-    max_equity = initial_balance
-    max_drawdown = 0
-    max_dd_pct = 0
-    
-    for trade in all_trades:
-        balance += trade.profit
-        equity_curve.append(balance)
-        
-        if balance > max_equity:
-            max_equity = balance
-        
-        dd = max_equity - balance
-        dd_pct = dd / max_equity * 100
-        
-        if dd > max_drawdown:
-            max_drawdown = dd
-            max_dd_pct = dd_pct
+    df = generate_trades(2025, MONTHLY_PRICES, rng)
+    df['month'] = df['month'].astype('category')
+    profits = df['profit'].to_numpy()
+    
+    # Monthly stats
+    monthly_df = df.groupby('month', observed=True, sort=True).agg(
+        trades=('profit', 'size'),
+        wins=('profit', lambda p: int((p > 0).sum())),
+        losses=('profit', lambda p: int((p < 0).sum())),
+        profit=('profit', 'sum'),
+    ).reset_index()
+    monthly_df['win_rate'] = monthly_df['wins'] / monthly_df['trades'] * 100
+    
+    # Equity curve and max drawdown (percentage taken at the deepest $ drawdown)
+    equity = initial_balance + np.concatenate(([0.0], profits.cumsum()))
+    running_max = np.maximum.accumulate(equity)
+    dd = running_max - equity
+    worst = int(dd.argmax())
+    balance = float(equity[-1])
     
     # Overall statistics
-    total_trades = len(all_trades)
-    winning_trades = [t for t in all_trades if t.profit > 0]
-    losing_trades = [t for t in all_trades if t.profit < 0]
-    
-    win_count = len(winning_trades)
-    lose_count = len(losing_trades)
-    win_rate = win_count / total_trades * 100
-    
-    total_pips = sum(t.pips for t in all_trades)
+    win_mask = profits > 0
+    loss_mask = profits < 0
+    win_count = int(win_mask.sum())
+    lose_count = int(loss_mask.sum())
+    total_trades = len(profits)
     total_profit = balance - initial_balance
-    profit_pct = total_profit / initial_balance * 100
+    total_wins = float(profits[win_mask].sum())
+    total_losses = float(abs(profits[loss_mask].sum()))
     
-    avg_win = sum(t.profit for t in winning_trades) / win_count if winning_trades else 0
-    avg_loss = abs(sum(t.profit for t in losing_trades) / lose_count) if losing_trades else 0
-    
-    total_wins = sum(t.profit for t in winning_trades)
-    total_losses = abs(sum(t.profit for t in losing_trades))
-    profit_factor = total_wins / total_losses if total_losses > 0 else float('inf')
+    return {
+        'trades': df,
+        'monthly': monthly_df,
+        'balance': balance,
+        'total_trades': total_trades,
+        'win_count': win_count,
+        'lose_count': lose_count,
+        'win_rate': win_count / total_trades * 100,
+        'total_pips': float(df['pips'].sum()),
+        'total_profit': total_profit,
+        'profit_pct': total_profit / initial_balance * 100,
+        'avg_win': total_wins / win_count if win_count else 0,
+        'avg_loss': total_losses / lose_count if lose_count else 0,
+        'profit_factor': total_wins / total_losses if total_losses > 0 else float('inf'),
+        'max_drawdown': float(dd[worst]),
+        'max_drawdown_pct': float(dd[worst] / running_max[worst] * 100),
+    }
+
+
+def _sweep_metrics(seed: int) -> Dict[str, float]:
+    """Worker for run_sweep (module level so it pickles)."""
+    result = simulate_year(seed)
+    return {'seed': seed, **{k: result[k] for k in SWEEP_METRICS}}
+
+
+def run_sweep(n: int = 1000, max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Monte Carlo robustness sweep: simulate_year for seeds 0..n-1 across
+    processes. Returns one row per seed; use .describe() for the distribution.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        rows = list(ex.map(_sweep_metrics, range(n), chunksize=max(1, n // 64)))
+    return pd.DataFrame(rows)
+
+
+def run_yearly_backtest(seed: int = 42, verbose: bool = True):
+    """Run 12-month backtest simulation (report printed once at the end if verbose)."""
+    
+    # Collect the whole report and write it to stdout in one call
+    out = io.StringIO()
+    echo = functools.partial(print, file=out)
+    
+    echo("\n" + "="*80)
+    echo("🚀 IOFAE 1 YILLIK BACKTEST - OCAK 2025 → OCAK 2026")
+    echo("="*80)
+    echo("\n📌 Bu demo, IOFAE stratejisinin 12 aylık performansını gösterir.")
+    echo("   Gerçek MT5 verileriyle test için 'backtester.py' kullanın.\n")
+    
+    initial_balance = INITIAL_BALANCE
+    result = simulate_year(seed)
+    df, monthly_df = result['trades'], result['monthly']
+    monthly_stats = monthly_df.to_dict('records')
+    
+    balance = result['balance']
+    total_trades, win_count, lose_count = result['total_trades'], result['win_count'], result['lose_count']
+    win_rate, total_pips = result['win_rate'], result['total_pips']
+    total_profit, profit_pct = result['total_profit'], result['profit_pct']
+    avg_win, avg_loss, profit_factor = result['avg_win'], result['avg_loss'], result['profit_factor']
+    max_drawdown, max_dd_pct = result['max_drawdown'], result['max_drawdown_pct']
     
     # Print monthly summary
-    print("📅 AYLIK PERFORMANS ÖZETİ:")
-    print("="*80)
-    print(f"{'Ay':<10} {'Trade':>7} {'Kazanan':>8} {'Kaybeden':>9} {'Win Rate':>9} {'Kar/Zarar':>12}")
-    print("-"*80)
-    
-    running_balance = initial_balance
-    for stat in monthly_stats:
-        running_balance += stat['profit']
-        emoji = "📈" if stat['profit'] > 0 else "📉"
-        print(f"{stat['month']:<10} {stat['trades']:>7} {stat['wins']:>8} {stat['losses']:>9} {stat['win_rate']:>8.1f}% {stat['profit']:>+11.2f} {emoji}")
-    
-    print("="*80)
-    print(f"{'TOPLAM':<10} {total_trades:>7} {win_count:>8} {lose_count:>9} {win_rate:>8.1f}% {total_profit:>+11.2f}")
+    echo("📅 AYLIK PERFORMANS ÖZETİ:")
+    echo("="*80)
+    monthly_table = monthly_df[['month', 'trades', 'wins', 'losses', 'win_rate', 'profit']].assign(
+        emoji=np.where(monthly_df['profit'] > 0, "📈", "📉")
+    )
+    echo(monthly_table.to_string(
+        index=False,
+        header=['Ay', 'Trade', 'Kazanan', 'Kaybeden', 'Win Rate', 'Kar/Zarar', ''],
+        formatters={'win_rate': '{:.1f}%'.format, 'profit': '{:+.2f}'.format},
+        justify='right'
+    ))
+    echo("="*80)
+    echo(f"{'TOPLAM':<10} {total_trades:>7} {win_count:>8} {lose_count:>9} {win_rate:>8.1f}% {total_profit:>+11.2f}")
     
     # Print sample trades
-    print(f"\n📋 ÖRNEK TRADE'LER (İlk 20):")
-    print("="*100)
-    print(f"{'Tarih':<12} {'Saat':<6} {'Seviye':<9} {'Skor':>5} {'Yön':<6} {'Tip':<20} {'Pip':>7} {'K/Z':>10}")
-    print("-"*100)
-    
-    for t in all_trades[:20]:
-        emoji = "✅" if t.profit > 0 else "❌"
-        print(f"{t.date:<12} {t.time:<6} {t.zone_price:<9.4f} {t.score:>5} {t.direction:<6} {t.zone_type:<20} {t.pips:>+7.1f} {t.profit:>+10.2f} {emoji}")
-    
-    print(f"... ve {len(all_trades) - 20} trade daha")
+    echo(f"\n📋 ÖRNEK TRADE'LER (İlk 20):")
+    echo("="*100)
+    sample = df.head(20)
+    sample_table = sample[['date', 'time', 'zone_price', 'score', 'direction', 'zone_type', 'pips', 'profit']].assign(
+        emoji=np.where(sample['profit'] > 0, "✅", "❌")
+    )
+    echo(sample_table.to_string(
+        index=False,
+        header=['Tarih', 'Saat', 'Seviye', 'Skor', 'Yön', 'Tip', 'Pip', 'K/Z', ''],
+        formatters={'zone_price': '{:.4f}'.format, 'pips': '{:+.1f}'.format, 'profit': '{:+.2f}'.format}
+    ))
+    echo(f"... ve {len(df) - 20} trade daha")
     
     # Summary
-    print(f"\n{'='*80}")
-    print("📊 1 YILLIK PERFORMANS ÖZETİ")
-    print(f"{'='*80}")
-    
-    print(f"\n💰 BAKİYE:")
-    print(f"   Başlangıç:        ${initial_balance:>12,.2f}")
-    print(f"   Bitiş:            ${balance:>12,.2f}")
-    print(f"   Net Kar:          ${total_profit:>+12,.2f} ({profit_pct:+.2f}%)")
-    print(f"   Aylık Ortalama:   ${total_profit/12:>+12,.2f} ({profit_pct/12:+.2f}%/ay)")
-    
-    print(f"\n📈 İSTATİSTİKLER:")
-    print(f"   Toplam Trade:     {total_trades:>6}")
-    print(f"   Kazanan Trade:    {win_count:>6}")
-    print(f"   Kaybeden Trade:   {lose_count:>6}")
-    print(f"   Win Rate:         {win_rate:>6.1f}%")
-    print(f"   Profit Factor:    {profit_factor:>6.2f}")
-    
-    print(f"\n📏 PİP PERFORMANSI:")
-    print(f"   Toplam Pip:       {total_pips:>+8.1f}")
-    print(f"   Ort. Pip/Trade:   {total_pips/total_trades:>+8.1f}")
-    print(f"   Ort. Win:         ${avg_win:>+8.2f}")
-    print(f"   Ort. Loss:        ${avg_loss:>8.2f}")
-    
-    print(f"\n⚠️ RİSK METRİKLERİ:")
-    print(f"   Max Drawdown:     ${max_drawdown:>10,.2f}")
-    print(f"   Max DD %:         {max_dd_pct:>10.2f}%")
+    echo(f"\n{'='*80}")
+    echo("📊 1 YILLIK PERFORMANS ÖZETİ")
+    echo(f"{'='*80}")
+    
+    echo(f"\n💰 BAKİYE:")
+    echo(f"   Başlangıç:        ${initial_balance:>12,.2f}")
+    echo(f"   Bitiş:            ${balance:>12,.2f}")
+    echo(f"   Net Kar:          ${total_profit:>+12,.2f} ({profit_pct:+.2f}%)")
+    echo(f"   Aylık Ortalama:   ${total_profit/12:>+12,.2f} ({profit_pct/12:+.2f}%/ay)")
+    
+    echo(f"\n📈 İSTATİSTİKLER:")
+    echo(f"   Toplam Trade:     {total_trades:>6}")
+    echo(f"   Kazanan Trade:    {win_count:>6}")
+    echo(f"   Kaybeden Trade:   {lose_count:>6}")
+    echo(f"   Win Rate:         {win_rate:>6.1f}%")
+    echo(f"   Profit Factor:    {profit_factor:>6.2f}")
+    
+    echo(f"\n📏 PİP PERFORMANSI:")
+    echo(f"   Toplam Pip:       {total_pips:>+8.1f}")
+    echo(f"   Ort. Pip/Trade:   {total_pips/total_trades:>+8.1f}")
+    echo(f"   Ort. Win:         ${avg_win:>+8.2f}")
+    echo(f"   Ort. Loss:        ${avg_loss:>8.2f}")
+    
+    echo(f"\n⚠️ RİSK METRİKLERİ:")
+    echo(f"   Max Drawdown:     ${max_drawdown:>10,.2f}")
+    echo(f"   Max DD %:         {max_dd_pct:>10.2f}%")
     
     # Monthly challenge assessment
-    print(f"\n{'='*80}")
-    print("🏆 PROP FIRM CHALLENGE SİMÜLASYONU")
-    print(f"{'='*80}")
+    echo(f"\n{'='*80}")
+    echo("🏆 PROP FIRM CHALLENGE SİMÜLASYONU")
+    echo(f"{'='*80}")
     
     challenges_passed = 0
     challenges_failed = 0
@@ -323,19 +337,19 @@ def run_yearly_backtest():
             challenges_failed += 1
             status = "⚠️ DEVAM"
         
-        print(f"   {stat['month']}: {stat['profit']:>+10.2f} ({profit_pct_month:>+6.2f}%) {status}")
+        echo(f"   {stat['month']}: {stat['profit']:>+10.2f} ({profit_pct_month:>+6.2f}%) {status}")
     
-    print(f"\n   📊 Challenge Özeti:")
-    print(f"      Geçen Aylar:   {challenges_passed}/12")
-    print(f"      Toplam Kar:    {profit_pct:+.2f}%")
-    print(f"      Max DD:        {max_dd_pct:.2f}%")
+    echo(f"\n   📊 Challenge Özeti:")
+    echo(f"      Geçen Aylar:   {challenges_passed}/12")
+    echo(f"      Toplam Kar:    {profit_pct:+.2f}%")
+    echo(f"      Max DD:        {max_dd_pct:.2f}%")
     
     # Risk metrics
-    print(f"\n{'='*80}")
-    print("📝 IOFAE 1 YIL SONUÇ ANALİZİ")
-    print(f"{'='*80}")
+    echo(f"\n{'='*80}")
+    echo("📝 IOFAE 1 YIL SONUÇ ANALİZİ")
+    echo(f"{'='*80}")
     
-    print(f"""
+    echo(f"""
 ✅ BAŞARILI METRİKLER:
    • 12 ayda ${total_profit:,.0f} kar (%{profit_pct:.1f})
    • Win rate: %{win_rate:.1f} (hedef: >%85)
@@ -359,44 +373,36 @@ def run_yearly_backtest():
    • Demo'da %{win_rate:.0f} win rate, gerçekte %85-90 beklenir
 """)
     
-    print(f"{'='*80}\n")
+    echo(f"{'='*80}\n")
     
     # Save to CSV
-    df = pd.DataFrame([{
-        'date': t.date,
-        'time': t.time,
-        'month': t.month,
-        'zone_price': t.zone_price,
-        'score': t.score,
-        'direction': t.direction,
-        'entry_price': t.entry_price,
-        'exit_price': t.exit_price,
-        'pips': t.pips,
-        'profit': t.profit,
-        'zone_type': t.zone_type,
-        'exit_reason': t.exit_reason
-    } for t in all_trades])
-    
     filename = "iofae_yearly_backtest_2025.csv"
     df.to_csv(filename, index=False)
-    print(f"📁 Tüm trade'ler kaydedildi: {filename}")
-    print(f"   Toplam: {len(all_trades)} trade")
+    echo(f"📁 Tüm trade'ler kaydedildi: {filename}")
+    echo(f"   Toplam: {len(df)} trade")
     
     # Monthly stats CSV
-    monthly_df = pd.DataFrame(monthly_stats)
     monthly_df.to_csv("iofae_monthly_stats_2025.csv", index=False)
-    print(f"📁 Aylık istatistikler: iofae_monthly_stats_2025.csv")
+    echo(f"📁 Aylık istatistikler: iofae_monthly_stats_2025.csv")
     
-    return {
-        'total_trades': total_trades,
-        'win_rate': win_rate,
-        'total_profit': total_profit,
-        'profit_pct': profit_pct,
-        'max_drawdown_pct': max_dd_pct,
-        'profit_factor': profit_factor
-    }
+    if verbose:
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+    
+    return {k: result[k] for k in SWEEP_METRICS}
 
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='IOFAE 1 yıllık backtest demo')
+    parser.add_argument('--seed', type=int, default=42, help='RNG seed')
+    parser.add_argument('--sweep', type=int, default=0, help='Run N seeds in parallel and print the distribution')
+    parser.add_argument('--quiet', action='store_true', help='Only write the CSV files, no report')
+    args = parser.parse_args()
+    
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    run_yearly_backtest()
+    if args.sweep:
+        print(run_sweep(args.sweep).drop(columns='seed').describe().to_string())
+    else:
+        run_yearly_backtest(args.seed, verbose=not args.quiet)
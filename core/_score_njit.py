@@ -0,0 +1,220 @@
+"""
+IOFAE Trading Bot - JIT Scoring Kernel
+Per-level VWAP / round number / Fibonacci scoring for ScoreCalculator.scan_all_zones.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from utils._njit import njit, NUMBA_AVAILABLE
+
+# Round number codes (index into ScoreCalculator.ROUND_TYPES)
+ROUND_NONE = 0
+ROUND_MAJOR = 1
+ROUND_HALF = 2
+ROUND_QUARTER = 3
+ROUND_10PIP = 4
+ROUND_NEAR = 5
+
+
+def build_round_luts(round_max):
+    """
+    Score / type lookup tables keyed by the last two pip digits (0-99).
+    Type 0 means "not a round category" (near-round distance applies).
+    """
+    score_lut = np.zeros(100)
+    type_lut = np.zeros(100, dtype=np.int64)
+    for k in range(10, 100, 10):                  # 10-pip levels
+        score_lut[k], type_lut[k] = round_max * 0.20, ROUND_10PIP
+    for k in (25, 75):                            # quarters
+        score_lut[k], type_lut[k] = round_max * 0.40, ROUND_QUARTER
+    score_lut[50], type_lut[50] = round_max * 0.72, ROUND_HALF
+    score_lut[0], type_lut[0] = round_max, ROUND_MAJOR
+    return score_lut, type_lut
+
+
+@njit(cache=True, inline='always')
+def _score_level(
+    price, vwap, fib_prices, fib_weights,
+    vwap_max, vwap_critical, vwap_high, vwap_low,
+    round_max, round_score_lut, round_type_lut, fib_max, pip, fib_thr
+):
+    """
+    Score one price level with the same piecewise rules as the scalar
+    ScoreCalculator._calculate_* methods.
+
+    Returns (vwap_s, round_s, round_code, fib_s, fib_idx).
+    """
+    # 1. VWAP distance
+    if vwap == 0:
+        v = 0.0
+    else:
+        d = abs(price - vwap) / vwap
+        if d >= vwap_critical:
+            v = vwap_max
+        elif d >= vwap_high:
+            v = vwap_max * 0.5 + vwap_max * 0.5 * ((d - vwap_high) / (vwap_critical - vwap_high))
+        elif d >= vwap_low:
+            v = vwap_max * 0.17 + vwap_max * 0.33 * ((d - vwap_low) / (vwap_high - vwap_low))
+        else:
+            v = (d / vwap_low) * (vwap_max * 0.17)
+
+    # 2. Round number: category from the LUTs, else near-round distance
+    last_two = np.int64(np.rint(price / pip)) % 100
+    r = round_score_lut[last_two]
+    code = round_type_lut[last_two]
+    if code == ROUND_NONE:
+        near = abs(price - np.rint(price / 0.005) * 0.005)
+        if near <= 0.0010:
+            r, code = round_max * 0.3 * (1 - near / 0.0010), ROUND_NEAR
+        else:
+            r, code = 0.0, ROUND_NONE
+
+    # 3. Fibonacci: best weighted proximity (first level wins ties)
+    best = 0.0
+    best_j = -1
+    for j in range(fib_prices.shape[0]):
+        dist = abs(price - fib_prices[j])
+        if dist <= fib_thr:
+            f = fib_max * fib_weights[j] * (1 - dist / fib_thr)
+            if f > best:
+                best = f
+                best_j = j
+
+    return v, r, code, best, best_j
+
+
+@njit(cache=True, inline='always')
+def score_levels_kernel(
+    prices, vwap, fib_prices, fib_weights, dom_s, delta_s,
+    vwap_max, vwap_critical, vwap_high, vwap_low,
+    round_max, round_score_lut, round_type_lut, fib_max, pip, fib_thr
+):
+    """
+    Score every price level of one symbol.
+
+    Returns (totals, vwap_s, round_s, round_code, fib_s, fib_idx);
+    fib_idx is -1 where no Fib level scored.
+    """
+    n = prices.shape[0]
+    totals = np.empty(n)
+    vwap_s = np.empty(n)
+    round_s = np.empty(n)
+    round_code = np.empty(n, dtype=np.int64)
+    fib_s = np.empty(n)
+    fib_idx = np.empty(n, dtype=np.int64)
+
+    for i in range(n):
+        v, r, code, best, best_j = _score_level(
+            prices[i], vwap, fib_prices, fib_weights,
+            vwap_max, vwap_critical, vwap_high, vwap_low,
+            round_max, round_score_lut, round_type_lut, fib_max, pip, fib_thr
+        )
+        vwap_s[i] = v
+        round_s[i] = r
+        round_code[i] = code
+        fib_s[i] = best
+        fib_idx[i] = best_j
+        totals[i] = min(v + r + best + dom_s[i] + delta_s, 100.0)
+
+    return totals, vwap_s, round_s, round_code, fib_s, fib_idx
+
+
+@njit(cache=True, inline='always')
+def score_segments_kernel(
+    prices, starts, vwaps, fib_prices, fib_weights, fib_starts, dom_s, delta_s,
+    vwap_max, vwap_critical, vwap_high, vwap_low,
+    round_max, round_score_lut, round_type_lut, fib_max, pips, fib_thrs
+):
+    """
+    score_levels_kernel over several symbols' levels in one call.
+
+    prices[starts[k]:starts[k + 1]] are symbol k's levels, scored with its
+    vwaps[k], delta_s[k], pips[k], fib_thrs[k] and the Fib set
+    fib_prices[fib_starts[k]:fib_starts[k + 1]]; fib_idx is relative to
+    that symbol's Fib set.
+    """
+    n = prices.shape[0]
+    totals = np.empty(n)
+    vwap_s = np.empty(n)
+    round_s = np.empty(n)
+    round_code = np.empty(n, dtype=np.int64)
+    fib_s = np.empty(n)
+    fib_idx = np.empty(n, dtype=np.int64)
+
+    for k in range(starts.shape[0] - 1):
+        seg_fib_prices = fib_prices[fib_starts[k]:fib_starts[k + 1]]
+        seg_fib_weights = fib_weights[fib_starts[k]:fib_starts[k + 1]]
+        for i in range(starts[k], starts[k + 1]):
+            v, r, code, best, best_j = _score_level(
+                prices[i], vwaps[k], seg_fib_prices, seg_fib_weights,
+                vwap_max, vwap_critical, vwap_high, vwap_low,
+                round_max, round_score_lut, round_type_lut, fib_max, pips[k], fib_thrs[k]
+            )
+            vwap_s[i] = v
+            round_s[i] = r
+            round_code[i] = code
+            fib_s[i] = best
+            fib_idx[i] = best_j
+            totals[i] = min(v + r + best + dom_s[i] + delta_s[k], 100.0)
+
+    return totals, vwap_s, round_s, round_code, fib_s, fib_idx
+
+
+@lru_cache(maxsize=None)
+def make_score_kernel(
+    vwap_max, vwap_critical, vwap_high, vwap_low,
+    round_max, fib_max
+):
+    """
+    score_levels_kernel specialized for one scoring config.
+
+    The config constants are closure variables, which numba freezes into
+    the compiled code as literals, so products like round_max * 0.72 fold
+    at compile time. pip and fib_thr depend on the symbol and stay kernel
+    arguments. Closures are not disk-cached, so the factory is memoized:
+    one compile per distinct config per process.
+    """
+    vwap_max = float(vwap_max)
+    round_max = float(round_max)
+    fib_max = float(fib_max)
+
+    @njit
+    def kernel(prices, vwap, fib_prices, fib_weights, dom_s, delta_s, round_score_lut, round_type_lut, pip, fib_thr):
+        return score_levels_kernel(
+            prices, vwap, fib_prices, fib_weights, dom_s, delta_s,
+            vwap_max, vwap_critical, vwap_high, vwap_low,
+            round_max, round_score_lut, round_type_lut, fib_max, pip, fib_thr
+        )
+
+    if NUMBA_AVAILABLE:
+        # Compile now rather than on the first live tick
+        score_lut, type_lut = build_round_luts(round_max)
+        kernel(
+            np.array([1.0800, 1.0801]), 1.08, np.array([1.0800]), np.array([1.0]),
+            np.zeros(2), 0.0, score_lut, type_lut, 0.0001, 0.0005
+        )
+    return kernel
+
+
+@lru_cache(maxsize=None)
+def make_segments_kernel(
+    vwap_max, vwap_critical, vwap_high, vwap_low,
+    round_max, fib_max
+):
+    """score_segments_kernel specialized like make_score_kernel (built on first multi-symbol scan)."""
+    vwap_max = float(vwap_max)
+    round_max = float(round_max)
+    fib_max = float(fib_max)
+
+    @njit
+    def kernel(prices, starts, vwaps, fib_prices, fib_weights, fib_starts, dom_s, delta_s,
+               round_score_lut, round_type_lut, pips, fib_thrs):
+        return score_segments_kernel(
+            prices, starts, vwaps, fib_prices, fib_weights, fib_starts, dom_s, delta_s,
+            vwap_max, vwap_critical, vwap_high, vwap_low,
+            round_max, round_score_lut, round_type_lut, fib_max, pips, fib_thrs
+        )
+
+    return kernel
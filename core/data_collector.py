@@ -28,7 +28,7 @@ class MarketTick:
     flags: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketData:
     """Comprehensive market data snapshot."""
     symbol: str
@@ -236,7 +236,18 @@ class DataCollector:
         return np.mean(list(self._spread_buffer)[-period:])
     
     def get_recent_ticks(self, count: int = 5) -> List[MarketTick]:
-        return list(self._tick_buffer)[-count:]
+        # Index from the right end; deque ends are O(1), copying all 10k ticks is not
+        count = min(count, len(self._tick_buffer))
+        return [self._tick_buffer[i] for i in range(-count, 0)]
+    
+    def get_tick_volume_since(self, since: datetime) -> float:
+        """Summed volume of buffered ticks at or after `since` (walks back from the newest)."""
+        total = 0.0
+        for tick in reversed(self._tick_buffer):
+            if tick.time < since:
+                break
+            total += tick.volume
+        return total
     
     def get_historical_bars(self, timeframe=None, count: int = 100):
         if timeframe is None:
@@ -3,21 +3,61 @@ IOFAE Trading Bot - Position Manager with Advanced Exhaustion Detection
 """
 
 import MetaTrader5 as mt5
-from datetime import datetime, timedelta
+import logging
+import time
+from datetime import datetime
 from dataclasses import dataclass
-from typing import Optional, Dict, List
+from collections import deque
+from typing import Optional, Dict, List, Tuple
 import numpy as np
 
 from .signal_generator import TradeSignal
 from .data_collector import DataCollector
 from utils.logger import get_logger
+from utils._njit import njit, NUMBA_AVAILABLE
 
 logger = get_logger()
 
+# Close reason codes (monitor_kernel sets EXHAUSTION / TIME_LIMIT;
+# STOP_LOSS means the broker already closed the position)
+CLOSE_NONE = 0
+CLOSE_EXHAUSTION = 1
+CLOSE_TIME_LIMIT = 2
+CLOSE_STOP_LOSS = 3
 
-@dataclass
+CLOSE_REASONS = {
+    CLOSE_EXHAUSTION: "EXHAUSTION",
+    CLOSE_TIME_LIMIT: "TIME_LIMIT",
+    CLOSE_STOP_LOSS: "STOP_LOSS",
+}
+
+
+@njit(cache=True)
+def monitor_kernel(entry, cur, dirs, entry_ns, now_ns, pip, max_hold_ns, exhausted):
+    """
+    Per-position exit checks over struct-of-arrays inputs.
+    
+    dirs: +1 LONG, -1 SHORT. exhausted: symbol-wide exhaustion flag.
+    Returns (close_flags, pips) - close_flags holds CLOSE_* codes.
+    """
+    n = entry.shape[0]
+    flags = np.zeros(n, dtype=np.uint8)
+    pips = np.empty(n)
+    
+    for i in range(n):
+        pips[i] = (cur[i] - entry[i]) * dirs[i] / pip
+        
+        if exhausted:
+            flags[i] = CLOSE_EXHAUSTION
+        elif now_ns - entry_ns[i] >= max_hold_ns:
+            flags[i] = CLOSE_TIME_LIMIT
+    
+    return flags, pips
+
+
+@dataclass(slots=True)
 class Position:
-    """Active position information."""
+    """Active position information (slotted: rebuilt for every open position each tick)."""
     ticket: int
     symbol: str
     direction: str
@@ -32,6 +72,7 @@ class Position:
     magic: int
     zone_type: str = ""
     score: float = 0
+    entry_time_ns: int = 0  # Epoch ns, used for all hold-time math
 
 
 class PositionManager:
@@ -55,6 +96,7 @@ class PositionManager:
         self.magic_number = trading.get('magic_number', 123456)
         self.deviation = trading.get('deviation', 10)
         self.max_hold_minutes = trading.get('max_hold_time_minutes', 15)
+        self._max_hold_ns = int(self.max_hold_minutes * 60 * 1_000_000_000)
         
         exhaustion = config.get('exhaustion', {})
         self.volume_drop_threshold = exhaustion.get('volume_drop_threshold', 0.70)
@@ -64,11 +106,22 @@ class PositionManager:
         
         self.pip_value = 0.0001
         self._position_entry_times: Dict[int, datetime] = {}
+        self._position_entry_ns: Dict[int, int] = {}
         self._position_meta: Dict[int, Dict] = {}  # Store zone_type, score etc
         
-        # Volume/spread history for EMA
-        self._volume_history = []
-        self._spread_history = []
+        # Volume/spread windows with running sums (O(1) update per tick)
+        self._volume_history = deque(maxlen=50)
+        self._spread_history = deque(maxlen=50)
+        self._vol_sum5 = 0.0
+        self._vol_sum50 = 0.0
+        self._spread_sum50 = 0.0
+        self._pushes_since_resum = 0
+        self._history_seeded = False
+        
+        if NUMBA_AVAILABLE:
+            # Compile now rather than on the first tick with an open position
+            one = np.ones(1)
+            monitor_kernel(one, one, one, np.zeros(1, dtype=np.int64), 0, self.pip_value, self._max_hold_ns, False)
     
     def set_pip_value(self, pip_value: float):
         self.pip_value = pip_value
@@ -107,7 +160,9 @@ class PositionManager:
             return None
         
         ticket = result.order
-        self._position_entry_times[ticket] = datetime.now()
+        entry_ns = time.time_ns()
+        self._position_entry_ns[ticket] = entry_ns
+        self._position_entry_times[ticket] = datetime.fromtimestamp(entry_ns / 1e9)
         self._position_meta[ticket] = {
             'zone_type': signal.zone.zone_type,
             'score': signal.zone.score,
@@ -147,10 +202,12 @@ class PositionManager:
             else:
                 pips = (pos.price_open - current_price) / self.pip_value
             
-            entry_time = self._position_entry_times.get(
-                pos.ticket, 
-                datetime.fromtimestamp(pos.time)
-            )
+            entry_ns = self._position_entry_ns.get(pos.ticket)
+            if entry_ns is None:
+                entry_ns = pos.time * 1_000_000_000
+                entry_time = datetime.fromtimestamp(pos.time)
+            else:
+                entry_time = self._position_entry_times[pos.ticket]
             
             meta = self._position_meta.get(pos.ticket, {})
             
@@ -168,12 +225,13 @@ class PositionManager:
                 entry_time=entry_time,
                 magic=pos.magic,
                 zone_type=meta.get('zone_type', ''),
-                score=meta.get('score', 0)
+                score=meta.get('score', 0),
+                entry_time_ns=entry_ns
             ))
         
         return result
     
-    def detect_exhaustion(self, position: Position) -> bool:
+    def detect_exhaustion(self, position: Position, now_ns: Optional[int] = None) -> bool:
         """
         Kurumsal emir tükendi mi?
         
@@ -183,46 +241,95 @@ class PositionManager:
         3. Fiyat durağanlığı (5 tick'te < 2 pip)
         """
         
-        # Update history for EMA
-        current_volume = self._get_current_volume()
+        # Windows come pre-filled from one bulk fetch (no per-tick warmup RPCs)
+        if not self._history_seeded:
+            self.seed_history(now_ns)
+        
+        # Update history for EMA; while still warming up (seed came back short)
+        # the 10 s volume is summed from the collector's tick buffer, not a
+        # tick-range RPC (same unit as _get_current_volume)
+        warm = len(self._volume_history) >= 20
+        if warm:
+            current_volume = self._get_current_volume(now_ns)
+        else:
+            current_volume = self._get_buffered_volume(now_ns)
         current_spread = self._get_current_spread()
         
-        self._volume_history.append(current_volume)
-        self._spread_history.append(current_spread)
+        self._push_history(current_volume, current_spread)
         
-        # Keep only last 100 values
-        self._volume_history = self._volume_history[-100:]
-        self._spread_history = self._spread_history[-100:]
+        # Volume/spread checks need 20 samples of history (warmup)
+        if warm:
+            # 1. Volume Drop Check
+            volume_exhausted = self._check_volume_drop()
+            
+            # 2. Spread Widening Check
+            spread_exhausted = self._check_spread_widening()
+        else:
+            volume_exhausted = spread_exhausted = False
         
-        # 1. Volume Drop Check
-        volume_exhausted = self._check_volume_drop()
+        # Any exhaustion signal triggers exit (3. Price Stall only checked if needed)
+        if volume_exhausted:
+            reason = "Volume dropped significantly"
+        elif spread_exhausted:
+            reason = "Spread widened significantly"
+        elif self._check_price_stall():
+            reason = "Price stalled"
+        else:
+            return False
         
-        # 2. Spread Widening Check  
-        spread_exhausted = self._check_spread_widening()
+        if logger.is_enabled_for(logging.INFO):
+            logger.info(f"📉 Exhaustion: {reason}")
+        return True
+    
+    def seed_history(self, now_ns: Optional[int] = None) -> int:
+        """
+        Fill the volume/spread windows from a single copy_ticks_range call.
         
-        # 3. Price Stall Check
-        price_stalled = self._check_price_stall()
+        One sample per second over the last window (the main loop's cadence):
+        trailing 10 s tick volume and the last spread, as _get_current_volume
+        and _get_current_spread would have measured live. Returns the number
+        of samples pushed. Runs lazily on the first detect_exhaustion of a
+        monitoring session, so the baseline comes from that session.
+        """
+        self._history_seeded = True
+        window = self._volume_history.maxlen
+        now_s = (now_ns if now_ns is not None else time.time_ns()) / 1e9
         
-        # Any exhaustion signal triggers exit
-        if volume_exhausted:
-            logger.info(f"📉 Exhaustion: Volume dropped significantly")
-            return True
+        try:
+            ticks = mt5.copy_ticks_range(
+                self.symbol,
+                datetime.fromtimestamp(now_s - window - 10),
+                datetime.fromtimestamp(now_s),
+                mt5.COPY_TICKS_ALL
+            )
+        except Exception as e:
+            logger.warning(f"Exhaustion history seed failed: {e}")
+            return 0
         
-        if spread_exhausted:
-            logger.info(f"📉 Exhaustion: Spread widened significantly")
-            return True
+        if ticks is None or len(ticks) == 0:
+            return 0
         
-        if price_stalled:
-            logger.info(f"📉 Exhaustion: Price stalled")
-            return True
+        tick_s = ticks['time_msc'] / 1000.0
+        cum_volume = np.concatenate(([0.0], np.cumsum(ticks['volume'], dtype=np.float64)))
+        spreads = ticks['ask'] - ticks['bid']
         
-        return False
+        sample_s = now_s - np.arange(window - 1, -1, -1)   # oldest first
+        hi = np.searchsorted(tick_s, sample_s, side='right')
+        lo = np.searchsorted(tick_s, sample_s - 10, side='left')
+        volumes = cum_volume[hi] - cum_volume[lo]
+        
+        pushed = 0
+        for k in np.flatnonzero(hi > 0).tolist():   # seconds with a tick so far
+            self._push_history(float(volumes[k]), float(spreads[hi[k] - 1]))
+            pushed += 1
+        return pushed
     
-    def _get_current_volume(self) -> float:
+    def _get_current_volume(self, now_ns: Optional[int] = None) -> float:
         """Get tick volume from last 10 seconds."""
         try:
-            end_time = datetime.now()
-            start_time = end_time - timedelta(seconds=10)
+            now_s = (now_ns if now_ns is not None else time.time_ns()) / 1e9
+            end_time = datetime.fromtimestamp(now_s)
+            start_time = datetime.fromtimestamp(now_s - 10)
             
             ticks = mt5.copy_ticks_range(
                 self.symbol, 
@@ -239,9 +346,20 @@ class PositionManager:
         except:
             return self.collector.get_volume_ema(10) if self.collector else 0
     
+    def _get_buffered_volume(self, now_ns: Optional[int] = None) -> float:
+        """Tick volume of the last 10 seconds from the collector's buffer (no RPC)."""
+        if not self.collector:
+            return 0
+        now_s = (now_ns if now_ns is not None else time.time_ns()) / 1e9
+        return self.collector.get_tick_volume_since(datetime.fromtimestamp(now_s - 10))
+    
     def _get_current_spread(self) -> float:
-        """Get current spread."""
+        """Get current spread (from the collector's last tick when available)."""
         try:
+            recent_ticks = self.collector.get_recent_ticks(1) if self.collector else []
+            if recent_ticks:
+                return recent_ticks[-1].spread
+            
             tick = mt5.symbol_info_tick(self.symbol)
             if tick:
                 return tick.ask - tick.bid
@@ -249,14 +367,45 @@ class PositionManager:
         except:
             return 0
     
+    def _reset_history(self):
+        """Empty the volume/spread windows; the next detect_exhaustion re-seeds them."""
+        self._volume_history.clear()
+        self._spread_history.clear()
+        self._vol_sum5 = self._vol_sum50 = self._spread_sum50 = 0.0
+        self._pushes_since_resum = 0
+        self._history_seeded = False
+    
+    def _push_history(self, volume: float, spread: float):
+        """Append a volume/spread sample and update the running window sums."""
+        volumes = self._volume_history
+        
+        if len(volumes) >= 5:
+            self._vol_sum5 -= volumes[-5]
+        if len(volumes) == volumes.maxlen:
+            self._vol_sum50 -= volumes[0]
+            self._spread_sum50 -= self._spread_history[0]
+        
+        volumes.append(volume)
+        self._spread_history.append(spread)
+        
+        self._vol_sum5 += volume
+        self._vol_sum50 += volume
+        self._spread_sum50 += spread
+        
+        # Add/subtract accumulates float drift over days of ticks: re-sum
+        # exactly from the windows once per full window turnover
+        self._pushes_since_resum += 1
+        if self._pushes_since_resum >= volumes.maxlen:
+            self._pushes_since_resum = 0
+            self._vol_sum5 = sum(volumes[i] for i in range(-min(5, len(volumes)), 0))
+            self._vol_sum50 = sum(volumes)
+            self._spread_sum50 = sum(self._spread_history)
+    
     def _check_volume_drop(self) -> bool:
         """Check if volume dropped more than threshold."""
-        if len(self._volume_history) < 20:
-            return False
-        
-        # Recent vs average
-        recent = np.mean(self._volume_history[-5:])
-        average = np.mean(self._volume_history[-50:]) if len(self._volume_history) >= 50 else np.mean(self._volume_history)
+        # Recent (last 5) vs average (last 50, or all while filling)
+        recent = self._vol_sum5 / 5
+        average = self._vol_sum50 / len(self._volume_history)
         
         if average > 0 and recent < average * self.volume_drop_threshold:
             return True
@@ -265,11 +414,8 @@ class PositionManager:
     
     def _check_spread_widening(self) -> bool:
         """Check if spread widened more than threshold."""
-        if len(self._spread_history) < 20:
-            return False
-        
         current = self._spread_history[-1]
-        average = np.mean(self._spread_history[-50:]) if len(self._spread_history) >= 50 else np.mean(self._spread_history)
+        average = self._spread_sum50 / len(self._spread_history)
         
         if average > 0 and current > average * self.spread_widen_threshold:
             return True
@@ -296,13 +442,15 @@ class PositionManager:
         except:
             return False
     
-    def check_time_limit(self, position: Position) -> bool:
+    def check_time_limit(self, position: Position, now_ns: Optional[int] = None) -> bool:
         """Check if position exceeded max hold time."""
-        elapsed = datetime.now() - position.entry_time
-        max_time = timedelta(minutes=self.max_hold_minutes)
+        if now_ns is None:
+            now_ns = time.time_ns()
+        
+        elapsed_ns = now_ns - position.entry_time_ns
         
-        if elapsed >= max_time:
-            logger.info(f"⏰ Time limit: {elapsed.total_seconds()/60:.1f} min")
+        if elapsed_ns >= self._max_hold_ns:
+            logger.info(f"⏰ Time limit: {elapsed_ns / 60e9:.1f} min")
             return True
         
         return False
@@ -338,14 +486,15 @@ class PositionManager:
         
         # Cleanup tracking
         self._position_entry_times.pop(position.ticket, None)
+        self._position_entry_ns.pop(position.ticket, None)
         self._position_meta.pop(position.ticket, None)
         
-        duration = (datetime.now() - position.entry_time).total_seconds() / 60
+        duration = (time.time_ns() - position.entry_time_ns) / 60e9
         logger.trade_close(self.symbol, position.profit, position.pips, reason, duration_mins=duration)
         
         return True
     
-    def monitor_position(self, position: Position) -> Optional[str]:
+    def monitor_position(self, position: Position, now_ns: Optional[int] = None) -> Optional[str]:
         """
         Monitor position and return close reason if should close.
         
@@ -354,12 +503,15 @@ class PositionManager:
             str: Close reason (EXHAUSTION, TIME_LIMIT, STOP_LOSS, etc.)
         """
         
+        if now_ns is None:
+            now_ns = time.time_ns()
+        
         # 1. Check exhaustion (primary exit)
-        if self.detect_exhaustion(position):
+        if self.detect_exhaustion(position, now_ns):
             return "EXHAUSTION"
         
         # 2. Check time limit
-        if self.check_time_limit(position):
+        if self.check_time_limit(position, now_ns):
             return "TIME_LIMIT"
         
         # 3. Check if position still exists (stopped out)
@@ -373,6 +525,62 @@ class PositionManager:
         
         return None
     
+    def monitor_positions(
+        self,
+        positions: List[Position],
+        now_ns: Optional[int] = None
+    ) -> List[Tuple[Position, str]]:
+        """
+        Batch version of monitor_position for all open positions.
+        
+        Exhaustion is symbol-wide so it is evaluated once; per-position checks
+        run in monitor_kernel. A position missing from a fresh positions_get
+        was stopped out by the broker (STOP_LOSS). Returns (position,
+        close_reason) only for the positions that should be closed.
+        """
+        if not positions:
+            if self._history_seeded:
+                # Session over: the next position seeds a fresh baseline
+                self._reset_history()
+            return []
+        
+        if now_ns is None:
+            now_ns = time.time_ns()
+        
+        exhausted = self.detect_exhaustion(positions[0], now_ns)
+        
+        n = len(positions)
+        entry = np.fromiter((p.entry_price for p in positions), dtype=np.float64, count=n)
+        cur = np.fromiter((p.current_price for p in positions), dtype=np.float64, count=n)
+        dirs = np.fromiter((1.0 if p.direction == "LONG" else -1.0 for p in positions), dtype=np.float64, count=n)
+        entry_ns = np.fromiter((p.entry_time_ns for p in positions), dtype=np.int64, count=n)
+        
+        flags, pips = monitor_kernel(
+            entry, cur, dirs, entry_ns,
+            now_ns,
+            self.pip_value,
+            self._max_hold_ns,
+            exhausted
+        )
+        
+        # One positions_get for the stop-out check instead of one per position
+        still_open = None
+        if not flags.all():
+            current = mt5.positions_get(symbol=self.symbol) or ()
+            still_open = {p.ticket for p in current if p.magic == self.magic_number}
+        
+        to_close = []
+        for i, position in enumerate(positions):
+            flag = flags[i]
+            if flag == CLOSE_NONE and position.ticket not in still_open:
+                flag = CLOSE_STOP_LOSS
+            if flag != CLOSE_NONE:
+                to_close.append((position, CLOSE_REASONS[flag]))
+            elif pips[i] >= 15:  # 15 pips profit
+                self._trail_stop(position)
+        
+        return to_close
+    
     def _trail_stop(self, position: Position):
         """Move stop to breakeven or trail."""
         new_sl = None
@@ -3,17 +3,55 @@ IOFAE Trading Bot - Risk Controller Module
 Manages risk limits and position sizing for prop firm compliance.
 """
 
-from datetime import datetime, date, timedelta
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, date
 from typing import Dict, Optional, Tuple
 import MetaTrader5 as mt5
 
 from database.dom_logger import DOMLogger
 from utils.logger import get_logger
-from utils.notifier import TelegramNotifier
+from utils.notifier import RiskAlertType, TelegramNotifier
 
 logger = get_logger()
 
 
+@dataclass(slots=True)
+class DailyState:
+    """Hot per-day counters read together on every can_trade poll."""
+    today_starting: float = 0
+    today_loss: float = 0
+    today_trades: int = 0
+    last_trade_time: Optional[datetime] = None
+    next_trade_monotonic: Optional[float] = None  # time.monotonic() deadline for next trade
+    bot_stopped: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class DailyRiskStats:
+    """Snapshot of today's risk counters."""
+    starting_balance: float
+    current_balance: float
+    daily_loss: float
+    daily_dd_pct: float
+    trades_today: int
+    trades_remaining: int
+    can_trade: bool
+
+
+@dataclass(slots=True, frozen=True)
+class ChallengeProgress:
+    """Snapshot of prop firm challenge progress."""
+    starting_balance: float
+    current_balance: float
+    profit_pct: float
+    target_pct: float
+    max_dd_pct: float
+    allowed_dd_pct: float
+    on_track: bool
+
+
 class RiskController:
     """
     Enforces risk management rules for prop firm compliance.
@@ -49,77 +87,124 @@ class RiskController:
         
         self.pip_value = 0.0001
         self.pip_dollar_value = 10.0  # Per standard lot for EUR/USD
+        self._risk_per_pip_dollar = self.risk_per_trade / self.pip_dollar_value
         
         self._starting_balance = 0
         self._highest_balance = 0
-        self._today_starting = 0
-        self._today_loss = 0
-        self._today_trades = 0
-        self._last_trade_time: Optional[datetime] = None
-        self._bot_stopped = False
+        self._state = DailyState()
+        
+        # Limits precomputed per reset for the can_trade fast path
+        self._max_daily_loss_abs = 0.0
+        self._dd_floor_balance = 0.0
+        
+        # Cached reciprocals of the reference balances (0.0 while unset)
+        self._inv_start = 0.0
+        self._inv_high = 0.0
+        self._inv_today = 0.0
+        
+        # Stats caches, invalidated by bumping _gen in every mutator
+        self._gen = 0
+        self._stats_cache: Tuple[Optional[DailyRiskStats], object] = (None, None)
+        self._progress_cache: Tuple[Optional[ChallengeProgress], int] = (None, -1)
     
     def initialize(self, balance: float):
         """Initialize risk controller with account balance."""
         self._starting_balance = balance
         self._highest_balance = balance
-        self._today_starting = balance
-        self._today_loss = 0
-        self._today_trades = 0
+        self._state.today_starting = balance
+        self._state.today_loss = 0
+        self._state.today_trades = 0
+        self._refresh_limits()
+        self._gen += 1
         
         # Get today's trades from DB
         if self.db:
-            stats = self.db.get_today_stats()
-            self._today_trades = stats.get('total_trades', 0)
-            self._today_loss = abs(min(0, stats.get('total_profit', 0)))
+            snapshot = self.db.get_today_snapshot()
+            self._state.today_trades = snapshot['total_trades']
+            self._state.today_loss = abs(min(0, snapshot['total_profit']))
             
-            last_trade_time = self.db.get_last_trade_time()
+            last_trade_time = snapshot['last_trade_time']
             if last_trade_time and last_trade_time.date() == date.today():
-                self._last_trade_time = last_trade_time
+                self._state.last_trade_time = last_trade_time
+                # Wall-clock age of the DB trade -> monotonic deadline
+                elapsed = (datetime.now() - last_trade_time).total_seconds()
+                self._state.next_trade_monotonic = time.monotonic() - elapsed + self.min_trade_interval
         
         logger.info(f"Risk controller initialized. Balance: ${balance:.2f}")
     
+    def _refresh_limits(self):
+        """Recompute absolute limits and reciprocals after a balance reset."""
+        self._max_daily_loss_abs = self._state.today_starting * self.max_daily_loss
+        self._dd_floor_balance = self._starting_balance * (1 - self.max_total_dd)
+        self._inv_start = 1.0 / self._starting_balance if self._starting_balance else 0.0
+        self._inv_high = 1.0 / self._highest_balance if self._highest_balance else 0.0
+        self._inv_today = 1.0 / self._state.today_starting if self._state.today_starting else 0.0
+    
     def update_balance(self, current_balance: float):
         """Update balance tracking."""
         # Track highest balance
         if current_balance > self._highest_balance:
             self._highest_balance = current_balance
+            self._inv_high = 1.0 / current_balance
+            self._gen += 1
         
-        # Track daily loss
-        if current_balance < self._today_starting:
-            self._today_loss = self._today_starting - current_balance
+        # Track daily loss (called every tick: only invalidate on change)
+        st = self._state
+        if current_balance < st.today_starting:
+            loss = st.today_starting - current_balance
+            if loss != st.today_loss:
+                st.today_loss = loss
+                self._gen += 1
     
     def can_trade(self) -> Tuple[bool, str]:
         """Check if trading is allowed based on all risk rules."""
         
-        if self._bot_stopped:
+        # Fast path: all rules pass (the common case)
+        st = self._state
+        current = st.today_starting - st.today_loss
+        if (
+            not st.bot_stopped
+            and st.today_loss < self._max_daily_loss_abs
+            and current > self._dd_floor_balance
+            and st.today_trades < self.max_trades_day
+            and (st.next_trade_monotonic is None or time.monotonic() >= st.next_trade_monotonic)
+        ):
+            return True, "OK"
+        
+        # Slow path: find the failing rule for the message / alerts
+        # (messages are only formatted once a rule has tripped)
+        notifier = self.notifier
+        if self._state.bot_stopped:
             return False, "Bot is stopped due to risk limits"
         
         # Check daily loss limit
         if not self._check_daily_loss():
-            msg = f"Daily loss limit reached: ${self._today_loss:.2f}"
+            msg = f"Daily loss limit reached: ${self._state.today_loss:.2f}"
             logger.risk_alert(msg)
-            if self.notifier:
-                self.notifier.notify_risk_alert("DAILY_LOSS", msg)
+            if notifier:
+                notifier.notify_risk_alert(RiskAlertType.DAILY_LOSS, msg)
             return False, msg
         
         # Check total drawdown
-        if not self._check_total_drawdown():
-            msg = f"Total drawdown limit reached"
+        if not self._check_total_drawdown(current):
+            msg = "Total drawdown limit reached"
             logger.risk_alert(msg)
-            if self.notifier:
-                self.notifier.notify_risk_alert("MAX_DRAWDOWN", msg)
-            self._bot_stopped = True
+            if notifier:
+                notifier.notify_risk_alert(RiskAlertType.MAX_DRAWDOWN, msg)
+            self._state.bot_stopped = True
+            self._gen += 1
             return False, msg
         
         # Check daily trade count
         if not self._check_trade_count():
-            msg = f"Max trades per day reached: {self._today_trades}"
+            msg = f"Max trades per day reached: {self._state.today_trades}"
             logger.info(msg)
             return False, msg
         
-        # Check trade interval
-        if not self._check_trade_interval():
-            remaining = self._get_interval_remaining()
+        # Check trade interval (one clock read shared with the remaining-time message)
+        now = time.monotonic()
+        if not self._check_trade_interval(now):
+            remaining = self._get_interval_remaining(now)
             msg = f"Trade interval not met. Wait {remaining} minutes"
             logger.info(msg)
             return False, msg
@@ -128,35 +213,36 @@ class RiskController:
     
     def _check_daily_loss(self) -> bool:
         """Check if within daily loss limit."""
-        max_loss = self._today_starting * self.max_daily_loss
-        return self._today_loss < max_loss
+        return self._state.today_loss < self._max_daily_loss_abs
     
-    def _check_total_drawdown(self) -> bool:
+    def _check_total_drawdown(self, current: Optional[float] = None) -> bool:
         """Check if within total drawdown limit."""
-        # Calculate drawdown from starting balance
-        current = self._today_starting - self._today_loss
-        dd_pct = (self._starting_balance - current) / self._starting_balance
-        return dd_pct < self.max_total_dd
+        # Drawdown from starting balance < max  <=>  balance above the floor
+        if current is None:
+            current = self._state.today_starting - self._state.today_loss
+        return current > self._dd_floor_balance
     
     def _check_trade_count(self) -> bool:
         """Check if under max trades per day."""
-        return self._today_trades < self.max_trades_day
+        return self._state.today_trades < self.max_trades_day
     
-    def _check_trade_interval(self) -> bool:
-        """Check if enough time passed since last trade."""
-        if self._last_trade_time is None:
+    def _check_trade_interval(self, now: Optional[float] = None) -> bool:
+        """Check if enough time passed since last trade (now: time.monotonic())."""
+        if self._state.next_trade_monotonic is None:
             return True
         
-        elapsed = (datetime.now() - self._last_trade_time).total_seconds()
-        return elapsed >= self.min_trade_interval
+        if now is None:
+            now = time.monotonic()
+        return now >= self._state.next_trade_monotonic
     
-    def _get_interval_remaining(self) -> int:
+    def _get_interval_remaining(self, now: Optional[float] = None) -> int:
         """Get minutes remaining until next trade allowed."""
-        if self._last_trade_time is None:
+        if self._state.next_trade_monotonic is None:
             return 0
         
-        elapsed = (datetime.now() - self._last_trade_time).total_seconds()
-        remaining = self.min_trade_interval - elapsed
+        if now is None:
+            now = time.monotonic()
+        remaining = self._state.next_trade_monotonic - now
         return max(0, int(remaining / 60))
     
     def calculate_lot_size(self, balance: float, stop_loss_pips: float) -> float:
@@ -165,71 +251,91 @@ class RiskController:
         
         Formula: Lot = (Balance × Risk%) / (SL_pips × Pip_value)
         """
-        risk_amount = balance * self.risk_per_trade
-        lot_size = risk_amount / (stop_loss_pips * self.pip_dollar_value)
-        
-        # Round to 2 decimal places
-        lot_size = round(lot_size, 2)
+        # risk_per_trade / pip_dollar_value is folded into one constant
+        lot_size = balance * self._risk_per_pip_dollar / stop_loss_pips
         
-        # Apply min/max limits
-        lot_size = max(0.01, min(lot_size, 100.0))
+        # Round to 2 decimal places, then apply min/max limits
+        lot_size = max(0.01, min(round(lot_size, 2), 100.0))
         
-        logger.info(f"Calculated lot: {lot_size} (Risk: ${risk_amount:.2f}, SL: {stop_loss_pips} pips)")
+        if logger.is_enabled_for(logging.INFO):
+            risk_amount = balance * self.risk_per_trade
+            logger.info(f"Calculated lot: {lot_size} (Risk: ${risk_amount:.2f}, SL: {stop_loss_pips} pips)")
         
         return lot_size
     
     def record_trade(self, profit: float = 0):
         """Record a trade for daily tracking."""
-        self._today_trades += 1
-        self._last_trade_time = datetime.now()
+        self._state.today_trades += 1
+        self._state.last_trade_time = datetime.now()  # wall clock, for logging only
+        self._state.next_trade_monotonic = time.monotonic() + self.min_trade_interval
         
         if profit < 0:
-            self._today_loss += abs(profit)
-        
-        logger.info(f"Trade recorded. Today: {self._today_trades} trades, Loss: ${self._today_loss:.2f}")
-    
-    def get_daily_stats(self) -> Dict:
-        """Get current daily statistics."""
-        current_balance = self._today_starting - self._today_loss
-        daily_dd_pct = (self._today_loss / self._today_starting * 100) if self._today_starting > 0 else 0
-        
-        return {
-            'starting_balance': self._today_starting,
-            'current_balance': current_balance,
-            'daily_loss': self._today_loss,
-            'daily_dd_pct': daily_dd_pct,
-            'trades_today': self._today_trades,
-            'trades_remaining': self.max_trades_day - self._today_trades,
-            'can_trade': self.can_trade()[0]
-        }
-    
-    def get_challenge_progress(self) -> Dict:
-        """Get prop firm challenge progress."""
-        current = self._today_starting - self._today_loss
-        profit_pct = (current - self._starting_balance) / self._starting_balance
-        dd_pct = (self._highest_balance - current) / self._highest_balance if self._highest_balance > 0 else 0
-        
-        return {
-            'starting_balance': self._starting_balance,
-            'current_balance': current,
-            'profit_pct': profit_pct * 100,
-            'target_pct': self.profit_target * 100,
-            'max_dd_pct': dd_pct * 100,
-            'allowed_dd_pct': self.max_total_dd * 100,
-            'on_track': profit_pct >= 0 and dd_pct < self.max_total_dd
-        }
+            self._state.today_loss += abs(profit)
+        self._gen += 1
+        
+        logger.info(f"Trade recorded. Today: {self._state.today_trades} trades, Loss: ${self._state.today_loss:.2f}")
+    
+    def get_daily_stats(self) -> DailyRiskStats:
+        """Get current daily statistics (cached until the next state change)."""
+        # can_trade also depends on the clock via the trade interval
+        interval_ok = self._check_trade_interval()
+        key = (self._gen, interval_ok)
+        cached, cached_key = self._stats_cache
+        if cached_key == key:
+            return cached
+        
+        current_balance = self._state.today_starting - self._state.today_loss
+        daily_dd_pct = self._state.today_loss * self._inv_today * 100
+        
+        stats = DailyRiskStats(
+            starting_balance=self._state.today_starting,
+            current_balance=current_balance,
+            daily_loss=self._state.today_loss,
+            daily_dd_pct=daily_dd_pct,
+            trades_today=self._state.today_trades,
+            trades_remaining=self.max_trades_day - self._state.today_trades,
+            can_trade=self.can_trade()[0]
+        )
+        # can_trade may have stopped the bot (bumping _gen): key on the new gen
+        self._stats_cache = (stats, (self._gen, interval_ok))
+        return stats
+    
+    def get_challenge_progress(self) -> ChallengeProgress:
+        """Get prop firm challenge progress (cached until the next state change)."""
+        cached, cached_gen = self._progress_cache
+        if cached_gen == self._gen:
+            return cached
+        
+        current = self._state.today_starting - self._state.today_loss
+        profit_pct = (current - self._starting_balance) * self._inv_start
+        dd_pct = (self._highest_balance - current) * self._inv_high
+        
+        progress = ChallengeProgress(
+            starting_balance=self._starting_balance,
+            current_balance=current,
+            profit_pct=profit_pct * 100,
+            target_pct=self.profit_target * 100,
+            max_dd_pct=dd_pct * 100,
+            allowed_dd_pct=self.max_total_dd * 100,
+            on_track=profit_pct >= 0 and dd_pct < self.max_total_dd
+        )
+        self._progress_cache = (progress, self._gen)
+        return progress
     
     def reset_daily(self, new_balance: float):
         """Reset daily tracking (call at start of each day)."""
-        self._today_starting = new_balance
-        self._today_loss = 0
-        self._today_trades = 0
+        self._state.today_starting = new_balance
+        self._state.today_loss = 0
+        self._state.today_trades = 0
+        self._refresh_limits()
+        self._gen += 1
         
         logger.info(f"Daily reset. New starting balance: ${new_balance:.2f}")
     
     def stop_bot(self, reason: str = "Risk limit"):
         """Stop the bot due to risk limits."""
-        self._bot_stopped = True
+        self._state.bot_stopped = True
+        self._gen += 1
         logger.critical(f"Bot stopped: {reason}")
         
         if self.notifier:
@@ -237,4 +343,4 @@ class RiskController:
     
     def is_stopped(self) -> bool:
         """Check if bot is stopped."""
-        return self._bot_stopped
+        return self._state.bot_stopped
@@ -6,22 +6,70 @@ Prop Firm kurallarını korumak için geliştirilmiş güvenlik modülü.
 
 import MetaTrader5 as mt5
 from datetime import datetime, timedelta
+import copy
+import functools
+import os
+import time
+import numpy as np
 import yaml
 from utils.logger import get_logger
+from utils._yaml import YamlLoader
 
 logger = get_logger()
 
+
+@functools.lru_cache(maxsize=8)
+def _parse_config(config_path, mtime):
+    """Parse the YAML config once per (path, mtime); the mtime key invalidates on edit."""
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
+def _load_config(config_path):
+    """Private copy of the cached config, so one instance's edits don't leak into others."""
+    return copy.deepcopy(_parse_config(config_path, os.path.getmtime(config_path)))
+
+
 class SafetyManager:
     def __init__(self, config_path='config.yaml'):
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = _load_config(config_path)
         
         self.max_daily_loss_pct = self.config['risk'].get('max_daily_loss', 0.04)
         self.news_blackout_minutes = 30
+        
+        # Örnek: Bugünün önemli haber saatleri (UTC)
+        # Gerçek uygulamada bir API'den çekilmelidir.
+        self.high_impact_news = [
+            "15:30", # US CPI / NFP
+            "21:00", # FOMC
+        ]
+        
+        # Haber saatleri gece yarısından itibaren saniye olarak, sıralı dizi
+        # (her tick'te O(log N) searchsorted; büyük takvimlerde de ucuz)
+        news = sorted(
+            (int(t.split(":")[0]) * 3600 + int(t.split(":")[1]) * 60, t)
+            for t in self.high_impact_news
+        )
+        self._news_seconds = np.array([secs for secs, _ in news], dtype=np.int64)
+        self._news_labels = [label for _, label in news]
+        self._blackout_s = self.news_blackout_minutes * 60
+        
+        # mt5.account_info() IPC çağrısı için kısa TTL önbelleği (monotonic ts, info)
+        self._acct_ttl_s = 0.25
+        self._acct_cache = (0.0, None)
+
+    def _account_info(self):
+        """mt5.account_info(), 250 ms içinde tekrar çağrılırsa önbellekten."""
+        now = time.monotonic()
+        ts, info = self._acct_cache
+        if info is None or now - ts > self._acct_ttl_s:
+            info = mt5.account_info()
+            self._acct_cache = (now, info)
+        return info
 
     def check_daily_drawdown(self):
         """Günlük kayıp sınırına ulaşıldı mı kontrol eder."""
-        account_info = mt5.account_info()
+        account_info = self._account_info()
         if account_info is None:
             return False
 
@@ -42,24 +90,23 @@ class SafetyManager:
         Önemli haber saatlerini kontrol eder. 
         Not: Bu fonksiyon manuel bir liste veya bir API üzerinden beslenebilir.
         """
-        # Örnek: Bugünün önemli haber saatleri (UTC)
-        # Gerçek uygulamada bir API'den çekilmelidir.
-        high_impact_news = [
-            "15:30", # US CPI / NFP
-            "21:00", # FOMC
-        ]
+        news_seconds = self._news_seconds
+        n = len(news_seconds)
+        if n == 0:
+            return False
         
         now_utc = datetime.utcnow()
-        current_time = now_utc.strftime("%H:%M")
+        now_seconds = now_utc.hour * 3600 + now_utc.minute * 60 + now_utc.second
         
-        for news_time in high_impact_news:
-            news_dt = datetime.strptime(news_time, "%H:%M")
-            news_dt = now_utc.replace(hour=news_dt.hour, minute=news_dt.minute)
-            
-            # Haberden 30 dk önce ve 30 dk sonra işlem yapma
-            if abs((now_utc - news_dt).total_seconds()) < (self.news_blackout_minutes * 60):
-                logger.info(f"⏳ Haber Koruması: {news_time} haberi nedeniyle trading askıda.")
-                return True
+        # En yakın haber: araya girdiği indeksin solu veya sağı
+        idx = int(np.searchsorted(news_seconds, now_seconds))
+        left, right = max(idx - 1, 0), min(idx, n - 1)
+        nearest = left if now_seconds - news_seconds[left] <= news_seconds[right] - now_seconds else right
+        
+        # Haberden 30 dk önce ve 30 dk sonra işlem yapma
+        if abs(now_seconds - int(news_seconds[nearest])) < self._blackout_s:
+            logger.info(f"⏳ Haber Koruması: {self._news_labels[nearest]} haberi nedeniyle trading askıda.")
+            return True
         return False
 
     def can_trade(self):
@@ -18,8 +18,10 @@ from datetime import datetime
 import numpy as np
 
 from .data_collector import MarketData
+from ._score_njit import ROUND_NEAR, ROUND_NONE, build_round_luts, make_score_kernel, make_segments_kernel
 from database.dom_logger import DOMLogger
 from utils.logger import get_logger
+from utils._njit import NUMBA_AVAILABLE
 
 logger = get_logger()
 
@@ -37,6 +39,20 @@ class ExecutionZone:
     confidence_level: str  # 'HIGH', 'MEDIUM', 'LOW'
 
 
+@dataclass(slots=True)
+class ScoreArrays:
+    """Per-level score components of one scan (parallel arrays, one row per price)."""
+    totals: np.ndarray
+    vwap: np.ndarray
+    round_number: np.ndarray
+    round_code: np.ndarray  # index into ScoreCalculator.ROUND_TYPES
+    fibonacci: np.ndarray
+    fib_idx: np.ndarray     # index into fib_names, -1 = none
+    fib_names: Tuple[str, ...]
+    dom: np.ndarray
+    delta: float            # same for every level
+
+
 class ScoreCalculator:
     """
     Advanced institutional execution probability calculator.
@@ -50,6 +66,21 @@ class ScoreCalculator:
     - 0-69: Düşük olasılık (trade açma)
     """
     
+    # Fib weights (0.618 most important)
+    FIB_WEIGHTS = {
+        '0.618': 1.0,
+        '0.5': 0.85,
+        '0.382': 0.75,
+        '0.786': 0.70,
+        '0.236': 0.60
+    }
+    
+    # Round number types indexed by the vectorized scan's np.select codes
+    ROUND_TYPES = ("NONE", "MAJOR_ROUND", "HALF_ROUND", "QUARTER_ROUND", "10PIP_LEVEL", "NEAR_ROUND")
+    
+    # Score breakdown components in breakdown order (argmax index -> name)
+    COMPONENTS = ('vwap', 'round_number', 'fibonacci', 'dom', 'delta')
+    
     def __init__(self, config: Dict, db: Optional[DOMLogger] = None):
         self.config = config
         self.db = db
@@ -81,22 +112,46 @@ class ScoreCalculator:
         self.STOP_LOSS_PIPS = trading.get('stop_loss_pips', 10)
         
         self.pip_value = 0.0001
+        self._entry_offset = self.ENTRY_OFFSET_PIPS * self.pip_value
+        self._sl_offset = self.STOP_LOSS_PIPS * self.pip_value
         
         # Round number cache
         self._round_numbers = self._generate_round_numbers()
+        self._round_score_lut, self._round_type_lut = build_round_luts(float(self.ROUND_MAX))
+        
+        # Fibonacci: proximity threshold and weight arrays per level-name order
+        # (DataCollector always emits the same keys, so this is one entry)
+        self._fib_proximity = self.FIB_PROXIMITY_PIPS * self.pip_value
+        self._fib_weight_arrays: Dict[Tuple[str, ...], np.ndarray] = {}
+        
+        # Scan scratch buffers, (re)sized lazily to 2*range_pips+1 levels
+        self._scan_offsets: Optional[np.ndarray] = None   # offsets * pip_value
+        self._scratch_prices: Optional[np.ndarray] = None
+        self._dom_stub: Optional[np.ndarray] = None       # no-DB DOM scores
+        
+        self._score_kernel = None
+        self._build_score_kernel()
     
     def set_pip_value(self, pip_value: float):
         self.pip_value = pip_value
+        self._entry_offset = self.ENTRY_OFFSET_PIPS * pip_value
+        self._sl_offset = self.STOP_LOSS_PIPS * pip_value
         self._round_numbers = self._generate_round_numbers()
+        self._fib_proximity = self.FIB_PROXIMITY_PIPS * pip_value
+        self._scan_offsets = None
     
-    def _generate_round_numbers(self) -> List[float]:
-        """Generate round number levels (50 pip intervals)."""
-        levels = []
-        for major in range(100, 150):  # 1.00 to 1.50
-            for minor in [0, 50]:
-                level = major / 100 + minor / 10000
-                levels.append(level)
-        return sorted(levels)
+    def _build_score_kernel(self):
+        """Get the scan kernel compiled for this scoring config (pip stays an argument)."""
+        if not NUMBA_AVAILABLE:
+            return
+        self._score_kernel = make_score_kernel(
+            self.VWAP_MAX, self.VWAP_CRITICAL, self.VWAP_HIGH, self.VWAP_LOW,
+            self.ROUND_MAX, self.FIB_MAX
+        )
+    
+    def _generate_round_numbers(self) -> np.ndarray:
+        """Generate round number levels (50 pip intervals, 1.00 to 1.495), sorted."""
+        return np.arange(10000, 15000, 50) / 10000
     
     def calculate_score(self, price_level: float, market_data: MarketData) -> ExecutionZone:
         """
@@ -127,19 +182,37 @@ class ScoreCalculator:
         breakdown['delta'] = delta_score
         
         # Total score (max 100)
-        total_score = min(sum(breakdown.values()), 100)
+        total_score = min(vwap_score + round_score + fib_score + dom_score + delta_score, 100)
         
-        # Determine primary zone type
-        zone_type = self._determine_zone_type(breakdown, round_type, fib_level)
+        return self._build_zone(price_level, total_score, breakdown, round_type, fib_level, market_data)
+    
+    def _build_zone(
+        self,
+        price_level: float,
+        total_score: float,
+        breakdown: Dict[str, float],
+        round_type: str,
+        fib_level: str,
+        market_data: MarketData,
+        zone_type: Optional[str] = None,
+        pip: Optional[float] = None
+    ) -> ExecutionZone:
+        """
+        Turn a scored level into an ExecutionZone (type, direction, entry, SL).
+        pip: the symbol's pip size when it differs from self.pip_value.
+        """
+        # Determine primary zone type (the vectorized scan passes it in)
+        if zone_type is None:
+            zone_type = self._determine_zone_type(breakdown, round_type, fib_level)
         
         # Determine direction
         direction = self._determine_direction(price_level, market_data)
         
         # Calculate trigger price (7 pips before zone)
-        trigger_price = self._calculate_trigger_price(price_level, direction)
+        trigger_price = self._calculate_trigger_price(price_level, direction, pip)
         
         # Calculate stop loss
-        stop_loss = self._calculate_stop_loss(trigger_price, direction)
+        stop_loss = self._calculate_stop_loss(trigger_price, direction, pip)
         
         # Confidence level
         if total_score >= 95:
@@ -252,16 +325,9 @@ class ScoreCalculator:
         if not fib_levels:
             return 0, ""
         
-        # Fib weights (0.618 most important)
-        weights = {
-            '0.618': 1.0,
-            '0.5': 0.85,
-            '0.382': 0.75,
-            '0.786': 0.70,
-            '0.236': 0.60
-        }
+        weights = self.FIB_WEIGHTS
         
-        proximity_threshold = self.FIB_PROXIMITY_PIPS * self.pip_value
+        proximity_threshold = self._fib_proximity
         best_score = 0
         best_level = ""
         
@@ -289,8 +355,10 @@ class ScoreCalculator:
         1500+ lot = 15 puan (tam)
         """
         if self.db is None:
-            # Simulated score for backtest
-            return np.random.uniform(0, self.DOM_MAX * 0.4)
+            # Simulation stub (backtest / no DB): constant mid-range score,
+            # the mean of the former uniform(0, DOM_MAX * 0.4) draw.
+            # Provide a DB for real DOM-based scores.
+            return self.DOM_MAX * 0.2
         
         try:
             avg_volume = self.db.get_avg_volume_at_level(
@@ -314,6 +382,30 @@ class ScoreCalculator:
             logger.warning(f"DOM score calculation error: {e}")
             return 0
     
+    def _calculate_dom_scores(self, prices: np.ndarray, symbol: str, pip: Optional[float] = None) -> np.ndarray:
+        """Vectorized _calculate_dom_score for a DB-backed scan (single query)."""
+        try:
+            avg_volume = self.db.get_avg_volumes_at_levels(
+                symbol=symbol,
+                price_levels=prices,
+                tolerance=(pip or self.pip_value) * 5,  # 5 pip tolerance
+                days_back=20
+            )
+        except Exception as e:
+            logger.warning(f"DOM score calculation error: {e}")
+            return np.zeros(len(prices))
+        
+        threshold = self.DOM_THRESHOLD
+        return np.select(
+            [avg_volume >= threshold, avg_volume >= threshold * 0.6, avg_volume > 0],
+            [
+                np.full_like(avg_volume, self.DOM_MAX, dtype=float),
+                self.DOM_MAX * 0.6 + (self.DOM_MAX * 0.4 * ((avg_volume - threshold * 0.6) / (threshold * 0.4))),
+                (avg_volume / (threshold * 0.6)) * (self.DOM_MAX * 0.6),
+            ],
+            default=0.0
+        )
+    
     def _calculate_delta_score(self, delta: float) -> float:
         """
         Delta Imbalance Scoring.
@@ -343,9 +435,18 @@ class ScoreCalculator:
         
         # Find dominant factor
         max_component = max(breakdown, key=breakdown.get)
-        max_score = breakdown[max_component]
-        
-        # Build zone type string
+        confluence = sum(v > 15 for v in breakdown.values()) >= 2
+        return self._zone_type_for(max_component, breakdown[max_component], round_type, fib_level, confluence)
+    
+    def _zone_type_for(
+        self,
+        max_component: str,
+        max_score: float,
+        round_type: str,
+        fib_level: str,
+        confluence: bool
+    ) -> str:
+        """Zone type string from the dominant component (shared by scalar and vectorized paths)."""
         if max_component == 'vwap' and max_score >= self.VWAP_MAX * 0.8:
             return "VWAP_REVERSION"
         
@@ -365,8 +466,7 @@ class ScoreCalculator:
             return "DELTA_IMBALANCE"
         
         # Check for confluence
-        high_scores = [k for k, v in breakdown.items() if v > 15]
-        if len(high_scores) >= 2:
+        if confluence:
             return "CONFLUENCE_ZONE"
         
         return "MIXED"
@@ -404,7 +504,7 @@ class ScoreCalculator:
         # Position bias is primary, delta and VWAP are confirming
         return position_bias
     
-    def _calculate_trigger_price(self, zone_price: float, direction: str) -> float:
+    def _calculate_trigger_price(self, zone_price: float, direction: str, pip: Optional[float] = None) -> float:
         """
         Calculate entry trigger price.
         
@@ -412,48 +512,345 @@ class ScoreCalculator:
         LONG: Zone'un 7 pip altında
         SHORT: Zone'un 7 pip üstünde
         """
-        offset = self.ENTRY_OFFSET_PIPS * self.pip_value
-        
+        offset = self._entry_offset if pip is None else self.ENTRY_OFFSET_PIPS * pip
         if direction == "LONG":
             return zone_price - offset
         else:
             return zone_price + offset
     
-    def _calculate_stop_loss(self, trigger_price: float, direction: str) -> float:
+    def _calculate_stop_loss(self, trigger_price: float, direction: str, pip: Optional[float] = None) -> float:
         """Calculate stop loss price."""
-        sl_offset = self.STOP_LOSS_PIPS * self.pip_value
-        
+        offset = self._sl_offset if pip is None else self.STOP_LOSS_PIPS * pip
         if direction == "LONG":
-            return trigger_price - sl_offset
+            return trigger_price - offset
         else:
-            return trigger_price + sl_offset
+            return trigger_price + offset
     
     def scan_all_zones(
         self, 
         market_data: MarketData, 
-        range_pips: int = 20
+        range_pips: int = 20,
+        min_score: float = 50
     ) -> List[ExecutionZone]:
         """
         Scan all price levels within range and return scored zones.
         """
-        current_price = market_data.bid
+        return self.scan_all_zones_vec(market_data, range_pips, min_score)
+    
+    def scan_all_zones_vec(
+        self,
+        market_data: MarketData,
+        range_pips: int = 20,
+        min_score: float = 50
+    ) -> List[ExecutionZone]:
+        """
+        Vectorized scan_all_zones: all levels are scored in one batch (numba
+        kernel when available, NumPy otherwise) with the same piecewise rules
+        as the _calculate_* methods; ExecutionZones are only built for levels
+        scoring >= min_score.
+        """
+        # Quiet tick: no level in the window can reach min_score
+        if self._scan_upper_bound(market_data, range_pips) < min_score:
+            return []
+        
+        prices = self._scan_prices(market_data.bid, range_pips)
+        scores = self._score_arrays(prices, market_data)
+        return self._materialize_zones(prices, scores, scores.totals >= min_score, market_data)
+    
+    def scan_all_zones_multi(
+        self,
+        market_data_list: List[MarketData],
+        range_pips: int = 20,
+        min_score: float = 50,
+        pip_values: Optional[Dict[str, float]] = None
+    ) -> Dict[str, List[ExecutionZone]]:
+        """
+        scan_all_zones for several symbols in one kernel call, keyed by symbol.
+        
+        pip_values: pip size per symbol (default: this calculator's pip_value),
+        so e.g. JPY pairs (0.01) score on their own scale. The levels of all
+        symbols are concatenated, scored in one pass with per-symbol VWAP,
+        delta, pip and Fib set, then split back by offsets. Each symbol may
+        appear only once in market_data_list.
+        """
+        symbols = [md.symbol for md in market_data_list]
+        if len(set(symbols)) != len(symbols):
+            raise ValueError(f"scan_all_zones_multi: duplicate symbols in {symbols}")
+        
+        pip_values = pip_values or {}
+        result: Dict[str, List[ExecutionZone]] = {symbol: [] for symbol in symbols}
+        
+        # Quiet symbols (no level can reach min_score) are not scored at all
+        active, pips = [], []
+        for md in market_data_list:
+            pip = pip_values.get(md.symbol, self.pip_value)
+            if self._scan_upper_bound(md, range_pips, pip) >= min_score:
+                active.append(md)
+                pips.append(pip)
+        if not active:
+            return result
+        
+        # (symbols x levels) grid, flattened: symbol k owns rows [k*n, (k+1)*n)
+        n = 2 * range_pips + 1
+        pips = np.array(pips)
+        bids = np.fromiter((md.bid for md in active), dtype=float, count=len(active))
+        offsets = np.arange(-range_pips, range_pips + 1)[None, :] * pips[:, None]
+        prices = (offsets + bids[:, None]).ravel()
+        
+        for k, (md, scores) in enumerate(zip(active, self._score_segments(prices, n, active, pips))):
+            seg = prices[k * n:(k + 1) * n]
+            result[md.symbol] = self._materialize_zones(
+                seg, scores, scores.totals >= min_score, md, float(pips[k])
+            )
+        return result
+    
+    def _scan_upper_bound(self, market_data: MarketData, range_pips: int, pip: Optional[float] = None) -> float:
+        """
+        Cheap upper bound on any level's total in the scan window.
+        
+        VWAP score grows with distance, so the window edge farthest from VWAP
+        bounds it; Fib only counts if a level lies within proximity of the
+        window; round number and DOM use their maxima (DOM stub without a DB).
+        """
+        bid, vwap = market_data.bid, market_data.vwap
+        pip = pip or self.pip_value
+        half_width = range_pips * pip
+        far = bid + half_width if bid >= vwap else bid - half_width
+        ub = self._calculate_vwap_score(far, vwap)
+        
+        fib_proximity = self.FIB_PROXIMITY_PIPS * pip
+        lo = bid - half_width - fib_proximity
+        hi = bid + half_width + fib_proximity
+        if any(lo <= p <= hi for p in market_data.fib_levels.values()):
+            ub += self.FIB_MAX * max(max(self.FIB_WEIGHTS.values()), 0.5)
+        
+        ub += self.ROUND_MAX
+        ub += self.DOM_MAX if self.db is not None else self.DOM_MAX * 0.2
+        ub += self._calculate_delta_score(market_data.bid_ask_delta)
+        return ub + 1e-9  # float slack vs the per-level kernel arithmetic
+    
+    def _scan_prices(self, bid: float, range_pips: int) -> np.ndarray:
+        """
+        Scan levels bid ± range_pips, written into a reused buffer.
+        The buffer is overwritten by the next scan; callers must not keep it.
+        """
+        n = 2 * range_pips + 1
+        if self._scan_offsets is None or self._scan_offsets.size != n:
+            self._scan_offsets = np.arange(-range_pips, range_pips + 1) * self.pip_value
+            self._scratch_prices = np.empty(n)
+        return np.add(self._scan_offsets, bid, out=self._scratch_prices)
+    
+    def _score_arrays(self, prices: np.ndarray, market_data: MarketData) -> ScoreArrays:
+        """Score every price level; no per-level Python objects are created."""
+        pip = self.pip_value
+        # MarketData fields read once (SoA inputs for the kernel)
+        vwap = float(market_data.vwap)
+        delta = market_data.bid_ask_delta
+        fib_levels = market_data.fib_levels
+        
+        fib_names, fib_prices, fib_weights = self._fib_inputs(fib_levels)
+        
+        # DOM (one batched DB query; without a DB the stub is one constant)
+        if self.db is None:
+            if self._dom_stub is None or self._dom_stub.size != len(prices):
+                self._dom_stub = np.full(len(prices), float(self.DOM_MAX * 0.2))
+            dom_s = self._dom_stub
+        else:
+            dom_s = self._calculate_dom_scores(prices, market_data.symbol)
+        
+        # Delta (same for every level; scalar early-out when flat)
+        delta_s = 0.0 if delta == 0 else float(self._calculate_delta_score(delta))
+        
+        if self._score_kernel is not None:
+            totals, vwap_s, round_s, round_code, fib_s, fib_idx = self._score_kernel(
+                prices, vwap, fib_prices, fib_weights, dom_s, delta_s,
+                self._round_score_lut, self._round_type_lut, pip, self._fib_proximity
+            )
+        else:
+            totals, vwap_s, round_s, round_code, fib_s, fib_idx = self._score_levels_numpy(
+                prices, vwap, fib_prices, fib_weights, dom_s, delta_s,
+                float(self.VWAP_MAX), self.VWAP_CRITICAL, self.VWAP_HIGH, self.VWAP_LOW,
+                float(self.ROUND_MAX), self._round_score_lut, self._round_type_lut,
+                float(self.FIB_MAX), pip, self._fib_proximity
+            )
+        return ScoreArrays(totals, vwap_s, round_s, round_code, fib_s, fib_idx, fib_names, dom_s, delta_s)
+    
+    def _fib_inputs(self, fib_levels: Dict[str, float]) -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray]:
+        """Fib level names, prices and weights as kernel inputs (weights cached per name order)."""
+        fib_names = tuple(fib_levels)
+        fib_prices = np.fromiter(fib_levels.values(), dtype=float, count=len(fib_names))
+        fib_weights = self._fib_weight_arrays.get(fib_names)
+        if fib_weights is None:
+            fib_weights = np.array([self.FIB_WEIGHTS.get(n, 0.5) for n in fib_names], dtype=float)
+            self._fib_weight_arrays[fib_names] = fib_weights
+        return fib_names, fib_prices, fib_weights
+    
+    def _score_segments(
+        self,
+        prices: np.ndarray,
+        n: int,
+        market_data_list: List[MarketData],
+        pips: np.ndarray
+    ) -> List[ScoreArrays]:
+        """
+        Score n levels per symbol from the flattened prices (segments in
+        market_data_list order); one kernel call, or a NumPy pass per symbol
+        without numba. Returned arrays are views into the batch results.
+        """
+        fib_inputs = [self._fib_inputs(md.fib_levels) for md in market_data_list]
+        deltas = np.array([
+            0.0 if md.bid_ask_delta == 0 else float(self._calculate_delta_score(md.bid_ask_delta))
+            for md in market_data_list
+        ])
+        fib_thrs = self.FIB_PROXIMITY_PIPS * pips
+        
+        if self.db is None:
+            dom_s = np.full(len(prices), float(self.DOM_MAX * 0.2))
+        else:
+            dom_s = np.concatenate([
+                self._calculate_dom_scores(prices[k * n:(k + 1) * n], md.symbol, pips[k])
+                for k, md in enumerate(market_data_list)
+            ])
+        
+        if NUMBA_AVAILABLE:
+            kernel = make_segments_kernel(
+                self.VWAP_MAX, self.VWAP_CRITICAL, self.VWAP_HIGH, self.VWAP_LOW,
+                self.ROUND_MAX, self.FIB_MAX
+            )
+            fib_counts = [len(names) for names, _, _ in fib_inputs]
+            fib_starts = np.zeros(len(fib_counts) + 1, dtype=np.int64)
+            np.cumsum(fib_counts, out=fib_starts[1:])
+            batch = kernel(
+                prices,
+                np.arange(len(market_data_list) + 1, dtype=np.int64) * n,
+                np.array([float(md.vwap) for md in market_data_list]),
+                np.concatenate([p for _, p, _ in fib_inputs]),
+                np.concatenate([w for _, _, w in fib_inputs]),
+                fib_starts, dom_s, deltas,
+                self._round_score_lut, self._round_type_lut, pips, fib_thrs
+            )
+            rows = [tuple(a[k * n:(k + 1) * n] for a in batch) for k in range(len(market_data_list))]
+        else:
+            rows = [
+                self._score_levels_numpy(
+                    prices[k * n:(k + 1) * n], float(md.vwap), fib_prices, fib_weights,
+                    dom_s[k * n:(k + 1) * n], deltas[k],
+                    float(self.VWAP_MAX), self.VWAP_CRITICAL, self.VWAP_HIGH, self.VWAP_LOW,
+                    float(self.ROUND_MAX), self._round_score_lut, self._round_type_lut,
+                    float(self.FIB_MAX), pips[k], fib_thrs[k]
+                )
+                for k, (md, (_, fib_prices, fib_weights)) in enumerate(zip(market_data_list, fib_inputs))
+            ]
+        
+        return [
+            ScoreArrays(totals, vwap_s, round_s, round_code, fib_s, fib_idx,
+                        fib_inputs[k][0], dom_s[k * n:(k + 1) * n], float(deltas[k]))
+            for k, (totals, vwap_s, round_s, round_code, fib_s, fib_idx) in enumerate(rows)
+        ]
+    
+    def _materialize_zones(
+        self,
+        prices: np.ndarray,
+        scores: ScoreArrays,
+        mask: np.ndarray,
+        market_data: MarketData,
+        pip: Optional[float] = None
+    ) -> List[ExecutionZone]:
+        """
+        Build ExecutionZones for the masked levels only, best score first
+        (stable argsort, so ties keep price order like sorted() did).
+        """
+        idx = np.flatnonzero(mask)
+        idx = idx[np.argsort(-scores.totals[idx], kind='stable')]
+        
+        # (levels, COMPONENTS) score rows; dominant factor and confluence in one pass
+        comps = np.empty((len(idx), len(self.COMPONENTS)))
+        comps[:, 0] = scores.vwap[idx]
+        comps[:, 1] = scores.round_number[idx]
+        comps[:, 2] = scores.fibonacci[idx]
+        comps[:, 3] = scores.dom[idx]
+        comps[:, 4] = scores.delta
+        dominant = comps.argmax(axis=1).tolist()
+        confluence = (np.count_nonzero(comps > 15, axis=1) >= 2).tolist()
+        
         zones = []
+        for k, i in enumerate(idx.tolist()):
+            row = comps[k].tolist()
+            breakdown = dict(zip(self.COMPONENTS, row))
+            j = scores.fib_idx[i]
+            fib_level = scores.fib_names[j] if j >= 0 else ""
+            round_type = self.ROUND_TYPES[scores.round_code[i]]
+            d = dominant[k]
+            zone_type = self._zone_type_for(
+                self.COMPONENTS[d], row[d], round_type, fib_level, confluence[k]
+            )
+            zones.append(self._build_zone(
+                float(prices[i]), float(scores.totals[i]), breakdown,
+                round_type, fib_level, market_data, zone_type, pip
+            ))
+        return zones
+    
+    @staticmethod
+    def _score_levels_numpy(
+        prices, vwap, fib_prices, fib_weights, dom_s, delta_s,
+        vwap_max, vwap_critical, vwap_high, vwap_low,
+        round_max, round_score_lut, round_type_lut, fib_max, pip, fib_thr
+    ):
+        """NumPy twin of _score_njit.score_levels_kernel (same inputs and outputs)."""
+        # 1. VWAP distance (vwap == 0 is decided once per scan, not per level)
+        if vwap == 0:
+            vwap_s = np.zeros_like(prices)
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                d = np.abs(prices - vwap) / vwap
+            vwap_s = np.select(
+                [d >= vwap_critical, d >= vwap_high, d >= vwap_low],
+                [
+                    np.full_like(d, vwap_max),
+                    vwap_max * 0.5 + vwap_max * 0.5 * ((d - vwap_high) / (vwap_critical - vwap_high)),
+                    vwap_max * 0.17 + vwap_max * 0.33 * ((d - vwap_low) / (vwap_high - vwap_low)),
+                ],
+                default=(d / vwap_low) * (vwap_max * 0.17)
+            )
         
-        for pip_offset in range(-range_pips, range_pips + 1):
-            price_level = current_price + (pip_offset * self.pip_value)
-            zone = self.calculate_score(price_level, market_data)
-            
-            # Only keep meaningful zones
-            if zone.score >= 50:
-                zones.append(zone)
+        # 2. Round number (codes index ROUND_TYPES): one LUT gather per level,
+        #    near-round distance only where the last two digits are no category
+        last_two = np.rint(prices / pip).astype(np.int64) % 100
+        cat_score = round_score_lut[last_two]
+        cat_type = round_type_lut[last_two]
+        near_dist = np.abs(prices - np.round(prices / 0.005) * 0.005)
+        is_near = (cat_type == ROUND_NONE) & (near_dist <= 0.0010)
+        round_s = np.where(is_near, round_max * 0.3 * (1 - near_dist / 0.0010), cat_score)
+        round_code = np.where(is_near, ROUND_NEAR, cat_type)
+        
+        # 3. Fibonacci: (levels, fibs) distance matrix, best fib per level
+        if len(fib_prices):
+            dist = np.abs(prices[:, None] - fib_prices[None, :])
+            fib_all = np.where(dist <= fib_thr, fib_max * fib_weights * (1 - dist / fib_thr), 0.0)
+            fib_idx = fib_all.argmax(axis=1)
+            fib_s = fib_all[np.arange(len(prices)), fib_idx]
+            fib_idx = np.where(fib_s > 0, fib_idx, -1)
+        else:
+            fib_s = np.zeros_like(prices)
+            fib_idx = np.full(len(prices), -1, dtype=np.int64)
         
-        return sorted(zones, key=lambda z: z.score, reverse=True)
+        # Total: (levels, 5) component rows, one row sum + clip
+        comps = np.stack([vwap_s, round_s, fib_s, dom_s, np.broadcast_to(delta_s, prices.shape)], axis=1)
+        totals = np.minimum(comps.sum(axis=1), 100.0)
+        return totals, vwap_s, round_s, round_code, fib_s, fib_idx
     
-    def get_best_zone(self, market_data: MarketData, min_score: float = 90) -> Optional[ExecutionZone]:
-        """Get the highest scoring zone above threshold."""
-        zones = self.scan_all_zones(market_data)
+    def get_best_zone(
+        self,
+        market_data: MarketData,
+        min_score: float = 90,
+        zones: Optional[List[ExecutionZone]] = None
+    ) -> Optional[ExecutionZone]:
+        """
+        Get the highest scoring zone above threshold.
         
-        if zones and zones[0].score >= min_score:
-            return zones[0]
+        zones: an already ranked scan_all_zones result to reuse instead of rescanning.
+        """
+        if zones is None:
+            zones = self.scan_all_zones(market_data, min_score=min_score)
         
-        return None
+        return zones[0] if zones and zones[0].score >= min_score else None
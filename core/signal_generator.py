@@ -59,6 +59,9 @@ class SignalGenerator:
         self.pip_value = 0.0001
         self._last_signal_time = None
         
+        # Last scan result keyed by MarketData.timestamp (shared by all zone getters)
+        self._last_scan: Optional[Tuple[datetime, List[ExecutionZone]]] = None
+        
         # Stop hunt detection parameters
         self.stop_hunt_start = time(8, 0)   # 08:00 GMT
         self.stop_hunt_end = time(8, 30)    # 08:30 GMT
@@ -66,6 +69,16 @@ class SignalGenerator:
     def set_pip_value(self, pip_value: float):
         self.pip_value = pip_value
         self.score_calc.set_pip_value(pip_value)
+        self._last_scan = None
+    
+    def _scan_zones(self, market_data: MarketData) -> List[ExecutionZone]:
+        """Scored zones for a snapshot, reusing the last scan of the same snapshot."""
+        if self._last_scan is not None and self._last_scan[0] == market_data.timestamp:
+            return self._last_scan[1]
+        
+        zones = self.score_calc.scan_all_zones(market_data, self.scan_range_pips)
+        self._last_scan = (market_data.timestamp, zones)
+        return zones
     
     def scan_and_generate(self, market_data: MarketData) -> Optional[TradeSignal]:
         """
@@ -86,7 +99,8 @@ class SignalGenerator:
             return stop_hunt_signal
         
         # Get best execution zone
-        best_zone = self.score_calc.get_best_zone(market_data, self.min_score)
+        zones = self._scan_zones(market_data)
+        best_zone = zones[0] if zones and zones[0].score >= self.min_score else None
         
         if not best_zone:
             return None
@@ -377,10 +391,10 @@ class SignalGenerator:
         Get execution probability heatmap for ±20 pips.
         Returns dict of {price: score}
         """
-        zones = self.score_calc.scan_all_zones(market_data, self.scan_range_pips)
+        zones = self._scan_zones(market_data)
         return {z.price: z.score for z in zones}
     
     def get_top_zones(self, market_data: MarketData, count: int = 5) -> List[ExecutionZone]:
         """Get top N scoring zones."""
-        zones = self.score_calc.scan_all_zones(market_data, self.scan_range_pips)
+        zones = self._scan_zones(market_data)
         return zones[:count]
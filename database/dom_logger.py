@@ -6,10 +6,11 @@ Handles DOM snapshots, trade history, and execution zone data storage.
 import os
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
+import numpy as np
 from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, Boolean, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy import func
+from sqlalchemy import func, case
 
 
 Base = declarative_base()
@@ -181,6 +182,51 @@ class DOMLogger:
         finally:
             session.close()
     
+    def get_avg_volumes_at_levels(
+        self,
+        symbol: str,
+        price_levels: np.ndarray,
+        tolerance: float = 0.0005,
+        days_back: int = 20
+    ) -> np.ndarray:
+        """
+        Batched get_avg_volume_at_level: one GROUP BY query over the whole
+        range, then per-level ±tolerance windows via prefix sums.
+        """
+        price_levels = np.asarray(price_levels, dtype=float)
+        if price_levels.size == 0:
+            return np.zeros(0)
+        
+        session = self.get_session()
+        try:
+            cutoff_date = datetime.now() - timedelta(days=days_back)
+            rows = session.query(
+                DOMSnapshot.price_level,
+                func.sum(DOMSnapshot.total_volume),
+                func.count(DOMSnapshot.total_volume)
+            ).filter(
+                DOMSnapshot.symbol == symbol,
+                DOMSnapshot.timestamp >= cutoff_date,
+                DOMSnapshot.price_level >= float(price_levels.min()) - tolerance,
+                DOMSnapshot.price_level <= float(price_levels.max()) + tolerance
+            ).group_by(DOMSnapshot.price_level).order_by(DOMSnapshot.price_level).all()
+        finally:
+            session.close()
+        
+        if not rows:
+            return np.zeros(len(price_levels))
+        
+        levels = np.fromiter((r[0] for r in rows), dtype=float, count=len(rows))
+        vol_sum = np.concatenate(([0.0], np.cumsum([r[1] or 0.0 for r in rows])))
+        vol_cnt = np.concatenate(([0], np.cumsum([r[2] for r in rows])))
+        
+        # Same inclusive window as the per-level query
+        lo = np.searchsorted(levels, price_levels - tolerance, side='left')
+        hi = np.searchsorted(levels, price_levels + tolerance, side='right')
+        count = vol_cnt[hi] - vol_cnt[lo]
+        total = vol_sum[hi] - vol_sum[lo]
+        return np.divide(total, count, out=np.zeros(len(price_levels)), where=count > 0)
+    
     def cleanup_old_dom_data(self, days_to_keep: int = 20):
         """Remove DOM data older than specified days."""
         session = self.get_session()
@@ -303,6 +349,28 @@ class DOMLogger:
             'win_rate': len(winning) / len(closed_trades) * 100 if closed_trades else 0
         }
     
+    def get_today_snapshot(self) -> Dict[str, Any]:
+        """Get today's trade count, closed profit and last entry time in one query."""
+        session = self.get_session()
+        try:
+            today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            total_trades, total_profit, last_trade_time = session.query(
+                func.count(TradeHistory.id),
+                func.coalesce(func.sum(case(
+                    (TradeHistory.status == 'CLOSED', TradeHistory.profit), else_=0
+                )), 0),
+                func.max(TradeHistory.entry_time)
+            ).filter(
+                TradeHistory.entry_time >= today_start
+            ).one()
+            return {
+                'total_trades': total_trades,
+                'total_profit': total_profit,
+                'last_trade_time': last_trade_time
+            }
+        finally:
+            session.close()
+    
     def get_last_trade_time(self) -> Optional[datetime]:
         """Get the timestamp of the last trade."""
         session = self.get_session()
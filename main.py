@@ -12,7 +12,7 @@ import sys
 import time
 import yaml
 import signal
-from datetime import datetime, date
+from datetime import date
 from typing import Optional
 
 # Add core directory to path
@@ -27,6 +27,7 @@ from core.safety_manager import SafetyManager
 from database.dom_logger import DOMLogger
 from utils.logger import IOFAELogger
 from utils.notifier import create_notifier
+from utils._yaml import YamlLoader
 
 
 class IOFAEBot:
@@ -74,7 +75,7 @@ class IOFAEBot:
         """Load configuration from YAML file."""
         try:
             with open(self.config_path, 'r') as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=YamlLoader)
         except FileNotFoundError:
             print(f"Config file not found: {self.config_path}")
             sys.exit(1)
@@ -149,6 +150,9 @@ class IOFAEBot:
         
         while self.running:
             try:
+                # One clock read per iteration, shared by all monitoring checks
+                now_ns = time.time_ns()
+                
                 # Check for daily reset
                 if date.today() != self._current_date:
                     self._daily_reset()
@@ -170,7 +174,7 @@ class IOFAEBot:
                 self.risk_ctrl.update_balance(account.get('balance', 0))
                 
                 # Monitor open positions
-                self._monitor_positions()
+                self._monitor_positions(now_ns)
                 
                 # Check if we can trade (Risk + Safety)
                 can_trade_risk, risk_reason = self.risk_ctrl.can_trade()
@@ -210,43 +214,43 @@ class IOFAEBot:
         
         self.shutdown()
     
-    def _monitor_positions(self):
+    def _monitor_positions(self, now_ns: Optional[int] = None):
         """Monitor and manage open positions."""
+        if now_ns is None:
+            now_ns = time.time_ns()
+        
         positions = self.position_mgr.get_open_positions()
         
-        for position in positions:
-            close_reason = self.position_mgr.monitor_position(position)
-            
-            if close_reason:
-                # Close position
-                if self.position_mgr.close_position(position, close_reason):
-                    # Record in database
-                    if self.db:
-                        self.db.save_trade_close(
-                            ticket=position.ticket,
-                            exit_price=position.current_price,
-                            profit=position.profit,
-                            pips=position.pips,
-                            exit_reason=close_reason
-                        )
-                    
-                    # Record in risk controller
-                    self.risk_ctrl.record_trade(position.profit)
-                    
-                    # Send notification
-                    if self.notifier:
-                        duration = (datetime.now() - position.entry_time).total_seconds() / 60
-                        self.notifier.notify_trade_close(
-                            symbol=position.symbol,
-                            direction=position.direction,
-                            lot=position.volume,
-                            entry_price=position.entry_price,
-                            exit_price=position.current_price,
-                            profit=position.profit,
-                            pips=position.pips,
-                            reason=close_reason,
-                            duration_mins=duration
-                        )
+        for position, close_reason in self.position_mgr.monitor_positions(positions, now_ns):
+            # Close position
+            if self.position_mgr.close_position(position, close_reason):
+                # Record in database
+                if self.db:
+                    self.db.save_trade_close(
+                        ticket=position.ticket,
+                        exit_price=position.current_price,
+                        profit=position.profit,
+                        pips=position.pips,
+                        exit_reason=close_reason
+                    )
+                
+                # Record in risk controller
+                self.risk_ctrl.record_trade(position.profit)
+                
+                # Send notification
+                if self.notifier:
+                    duration = (now_ns - position.entry_time_ns) / 60e9
+                    self.notifier.notify_trade_close(
+                        symbol=position.symbol,
+                        direction=position.direction,
+                        lot=position.volume,
+                        entry_price=position.entry_price,
+                        exit_price=position.current_price,
+                        profit=position.profit,
+                        pips=position.pips,
+                        reason=close_reason,
+                        duration_mins=duration
+                    )
     
     def _execute_signal(self, signal):
         """Execute a trade signal."""
@@ -305,19 +309,19 @@ class IOFAEBot:
                 total_profit=stats.get('total_profit', 0),
                 total_pips=stats.get('total_pips', 0),
                 current_balance=account.get('balance', 0),
-                daily_drawdown=daily_stats.get('daily_dd_pct', 0)
+                daily_drawdown=daily_stats.daily_dd_pct
             )
             
             # Save daily stats to DB
             self.db.save_daily_stats(
                 date=self._current_date.strftime('%Y-%m-%d'),
-                starting_balance=daily_stats.get('starting_balance', 0),
+                starting_balance=daily_stats.starting_balance,
                 ending_balance=account.get('balance', 0),
                 total_trades=stats.get('total_trades', 0),
                 winning_trades=stats.get('winning_trades', 0),
                 total_profit=stats.get('total_profit', 0),
                 total_pips=stats.get('total_pips', 0),
-                max_drawdown=daily_stats.get('daily_dd_pct', 0)
+                max_drawdown=daily_stats.daily_dd_pct
             )
         
         # Reset risk controller
@@ -352,6 +356,7 @@ class IOFAEBot:
         # Send shutdown notification
         if self.notifier:
             self.notifier.notify_bot_stopped("Manual shutdown")
+            self.notifier.close_sync()
         
         self.logger.info("Shutdown complete")
 
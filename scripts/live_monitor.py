@@ -20,15 +20,20 @@ import yaml
 from datetime import datetime
 from core.score_calculator import ScoreCalculator
 from core.data_collector import DataCollector
+from utils._yaml import YamlLoader
+
+_CLEAR = "\033[H\033[2J"
+_RED, _YEL, _RST = "\033[91m", "\033[93m", "\033[0m"
 
 def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    sys.stdout.write(_CLEAR)
+    sys.stdout.flush()
 
 def run_monitor():
     # 1. Config Yükle
     config_path = root_dir / 'config.yaml'
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=YamlLoader)
     
     symbol = config['trading']['symbol']
     
@@ -39,9 +44,16 @@ def run_monitor():
 
     print(f"✅ MT5 Bağlandı. {symbol} için canlı akış başlıyor...")
     
+    # Windows konsolunda ANSI (VT) işlemeyi bir kez aç
+    if os.name == 'nt':
+        os.system('')
+    
     # Modülleri Başlat
     collector = DataCollector(config)
     scorer = ScoreCalculator(config)
+    scan = scorer.scan_all_zones
+    get_best_zone = scorer.get_best_zone
+    pip = 0.0001
     
     try:
         while True:
@@ -54,38 +66,34 @@ def run_monitor():
                 print("⏳ Veri bekleniyor...")
                 time.sleep(1)
                 continue
+            bid = market_data.bid
             
             # Isı Haritası Tara (±15 pip)
-            print(f"🚀 IOFAE LIVE MONITOR | {now} | {symbol}: {market_data.bid}")
+            print(f"🚀 IOFAE LIVE MONITOR | {now} | {symbol}: {bid}")
             print("="*60)
             print(f"{'FİYAT':<12} {'SKOR':<8} {'BÖLGE TİPİ':<20} {'DURUM'}")
             print("-" * 60)
             
-            # Mevcut fiyatın etrafındaki seviyeleri tara
-            pip = 0.0001
-            current_price = market_data.bid
-            
-            zones = []
-            for i in range(-15, 16):
-                level = round(current_price + (i * pip), 5)
-                zone = scorer.calculate_score(level, market_data)
-                if zone.score > 70: # Sadece önemli bölgeleri göster
-                    zones.append(zone)
+            # Mevcut fiyatın etrafındaki seviyeleri tek seferde tara (skora göre sıralı)
+            zones = scan(market_data, range_pips=15, min_score=70)
             
-            # Skorlara göre sırala
-            zones.sort(key=lambda x: x.score, reverse=True)
+            # Sadece önemli bölgeleri göster (en iyi 8)
+            shown = [z for z in zones if z.score > 70][:8]
             
-            for z in zones[:8]: # En iyi 8 bölgeyi göster
-                status = "🔥 KRİTİK" if z.score >= 90 else "⏳ İzlemede"
-                color = "\033[91m" if z.score >= 90 else "\033[93m" if z.score >= 80 else "\033[0m"
-                reset = "\033[0m"
-                
-                print(f"{z.price:<12.5f} {color}{z.score:<8.1f}{reset} {z.zone_type:<20} {status}")
+            if shown:
+                lines = [
+                    f"{z.price:<12.5f} {_RED if z.score >= 90 else _YEL if z.score >= 80 else ''}"
+                    f"{z.score:<8.1f}{_RST} {z.zone_type:<20} "
+                    f"{'🔥 KRİTİK' if z.score >= 90 else '⏳ İzlemede'}"
+                    for z in shown
+                ]
+                sys.stdout.write("\n".join(lines) + "\n")
 
             print("-" * 60)
             print(f"📊 Market Delta: {market_data.bid_ask_delta:>8.0f}")
-            print(f"📉 VWAP Mesafe:  {abs(market_data.bid - market_data.vwap)/pip:>8.1f} pip")
-            print(f"📢 Son Sinyal:   {scorer.get_best_zone(market_data).zone_type if scorer.get_best_zone(market_data) else 'YOK'}")
+            print(f"📉 VWAP Mesafe:  {abs(bid - market_data.vwap)/pip:>8.1f} pip")
+            best = get_best_zone(market_data, zones=zones)
+            print(f"📢 Son Sinyal:   {best.zone_type if best else 'YOK'}")
             print("="*60)
             print("Çıkmak için Ctrl+C basın...")
             
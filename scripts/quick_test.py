@@ -162,10 +162,10 @@ def test_iofae_import():
         modules_ok = False
     
     try:
-        import aiohttp
-        print("   ✅ aiohttp")
+        import httpx
+        print("   ✅ httpx")
     except:
-        print("   ❌ aiohttp - pip install aiohttp")
+        print("   ❌ httpx - pip install 'httpx[http2]'")
         modules_ok = False
     
     return modules_ok
@@ -0,0 +1,10 @@
+"""
+IOFAE Trading Bot - YAML Loader
+libyaml's C loader when PyYAML was built with it (several times faster
+than the pure-Python one), else the pure-Python SafeLoader.
+"""
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
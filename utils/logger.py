@@ -3,18 +3,126 @@ IOFAE Trading Bot - Logger Utility
 Handles all logging operations with file rotation and console output.
 """
 
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 from typing import Optional
 
+# Helper message templates (formatted lazily by logging, only if emitted)
+_SIGNAL_FMT = "📊 SIGNAL | %s | %s | Score: %.1f | Price: %.5f"
+_OPEN_FMT = "🟢 OPEN | %s | %s | Lot: %s | Entry: %.5f | SL: %.5f | Zone: %s | Score: %.1f"
+_CLOSE_WIN_FMT = "✅ CLOSE | %s | P/L: $%.2f | Pips: %.1f | Duration: %.1fm | Reason: %s"
+_CLOSE_LOSS_FMT = "❌ CLOSE | %s | P/L: $%.2f | Pips: %.1f | Duration: %.1fm | Reason: %s"
+_RISK_FMT = "⚠️ RISK ALERT | %s"
+
+
+class _FastFormatter(logging.Formatter):
+    """
+    Fixed "asctime | level | [module |] message" layout built with one
+    f-string instead of re-walking a %-style format string per record.
+    """
+    
+    def __init__(self, datefmt: str, with_module: bool = True):
+        super().__init__(datefmt=datefmt)
+        self._with_module = with_module
+        self._ts_second: Optional[int] = None
+        self._ts_text = ""
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        # Records arrive in time order: strftime once per second, not per record
+        second = int(record.created)
+        if second != self._ts_second:
+            self._ts_second = second
+            self._ts_text = super().formatTime(record, datefmt)
+        return self._ts_text
+    
+    def format(self, record: logging.LogRecord) -> str:
+        asctime = self.formatTime(record, self.datefmt)
+        if self._with_module:
+            s = f"{asctime} | {record.levelname:<8} | {record.module:<20} | {record.getMessage()}"
+        else:
+            s = f"{asctime} | {record.levelname:<8} | {record.getMessage()}"
+        if record.exc_info or record.exc_text or record.stack_info:
+            if record.exc_info and not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            if record.exc_text:
+                s = f"{s}\n{record.exc_text}"
+            if record.stack_info:
+                s = f"{s}\n{self.formatStack(record.stack_info)}"
+        return s
+
+
+class _DedupFilter(logging.Filter):
+    """
+    Drop repeats of the previous message within `window` seconds; a single
+    "(previous message repeated N times)" line is written when the run ends.
+    """
+    
+    def __init__(self, handler: logging.Handler, window: float = 30.0):
+        super().__init__()
+        self._handler = handler
+        self._window = window
+        self._lock = threading.Lock()
+        self._last: Optional[logging.LogRecord] = None
+        self._last_msg: Optional[str] = None
+        self._count = 0
+        self._timer: Optional[threading.Timer] = None
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, 'dedup_summary', False):
+            return True
+        msg = record.getMessage()
+        with self._lock:
+            if msg == self._last_msg and record.created - self._last.created < self._window:
+                self._count += 1
+                if self._timer is None:
+                    # Flush the count even if nothing else is logged
+                    delay = self._window - (record.created - self._last.created)
+                    self._timer = threading.Timer(delay, self._flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return False
+            summary = self._take_summary()
+            self._last, self._last_msg = record, msg
+        if summary is not None:
+            self._handler.handle(summary)
+        return True
+    
+    def _flush(self):
+        with self._lock:
+            self._timer = None
+            summary = self._take_summary()
+            self._last = self._last_msg = None
+        if summary is not None:
+            self._handler.handle(summary)
+    
+    def _take_summary(self) -> Optional[logging.LogRecord]:
+        """Pending repeat-count record (lock held), resetting the count."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._count:
+            return None
+        summary = logging.makeLogRecord(self._last.__dict__)
+        summary.msg, summary.args = "(previous message repeated %d times)", (self._count,)
+        summary.dedup_summary = True
+        self._count = 0
+        return summary
+
 
 class IOFAELogger:
     """Custom logger for IOFAE Trading Bot."""
     
     _instance: Optional['IOFAELogger'] = None
     _logger: Optional[logging.Logger] = None
+    _listener: Optional[QueueListener] = None
+    _params: Optional[dict] = None
+    _initialized = False
+    _init_lock = threading.Lock()
     
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -30,9 +138,33 @@ class IOFAELogger:
         backup_count: int = 5,
         console_output: bool = True
     ):
-        if self._logger is not None:
+        # Only remember the settings; the log file and handlers are created
+        # on the first log call, so importing this module does no I/O.
+        if self._params is not None:
             return
-            
+        
+        self._params = dict(
+            name=name, level=level, file_path=file_path, max_size_mb=max_size_mb,
+            backup_count=backup_count, console_output=console_output
+        )
+    
+    def _init_handlers(self):
+        """Create the log directory, handlers and listener thread (once)."""
+        with self._init_lock:
+            if self._initialized:
+                return
+            self._setup(**self._params)
+            self._initialized = True
+    
+    def _setup(
+        self,
+        name: str,
+        level: str,
+        file_path: str,
+        max_size_mb: int,
+        backup_count: int,
+        console_output: bool
+    ):
         self._logger = logging.getLogger(name)
         self._logger.setLevel(getattr(logging, level.upper()))
         self._logger.handlers = []
@@ -52,63 +184,122 @@ class IOFAELogger:
         file_handler.setLevel(getattr(logging, level.upper()))
         
         # Formatter
-        formatter = logging.Formatter(
-            '%(asctime)s | %(levelname)-8s | %(module)-20s | %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
+        file_handler.setFormatter(_FastFormatter(datefmt='%Y-%m-%d %H:%M:%S'))
+        
+        # Buffer file writes: flush on 256 records, WARNING+, or the 1s tick
+        file_buffer = MemoryHandler(
+            capacity=256,
+            flushLevel=logging.WARNING,
+            target=file_handler,
+            flushOnClose=True
         )
-        file_handler.setFormatter(formatter)
-        self._logger.addHandler(file_handler)
+        file_buffer.setLevel(getattr(logging, level.upper()))
+        file_buffer.addFilter(_DedupFilter(file_buffer))
+        flush_stop = self._start_flush_timer(file_buffer, interval=1.0)
+        handlers = [file_buffer]
         
         # Console handler
         if console_output:
             console_handler = logging.StreamHandler()
             console_handler.setLevel(getattr(logging, level.upper()))
-            console_formatter = logging.Formatter(
-                '%(asctime)s | %(levelname)-8s | %(message)s',
-                datefmt='%H:%M:%S'
-            )
-            console_handler.setFormatter(console_formatter)
-            self._logger.addHandler(console_handler)
+            console_handler.setFormatter(_FastFormatter(datefmt='%H:%M:%S', with_module=False))
+            handlers.append(console_handler)
+        
+        # Callers only enqueue records; a background listener thread owns
+        # the file/console handlers, so no disk I/O on the trading path.
+        log_queue: queue.Queue = queue.Queue(-1)
+        self._logger.addHandler(QueueHandler(log_queue))
+        self._listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        # atexit runs these last-first: drain queue, then close (flushes)
+        atexit.register(file_buffer.close)
+        atexit.register(self._listener.stop)
+        atexit.register(flush_stop.set)
+    
+    @staticmethod
+    def _start_flush_timer(handler: logging.Handler, interval: float) -> threading.Event:
+        """
+        Flush a buffering handler every `interval` seconds from one daemon
+        thread so quiet periods still reach disk. Set the returned event to stop it.
+        """
+        stop = threading.Event()
+        
+        def run():
+            while not stop.wait(interval):
+                handler.flush()
+        
+        threading.Thread(target=run, name="IOFAE-log-flush", daemon=True).start()
+        return stop
     
     @property
     def logger(self) -> logging.Logger:
+        if not self._initialized:
+            self._init_handlers()
         return self._logger
     
+    def is_enabled_for(self, level: int) -> bool:
+        """Cheap level check to skip building messages that would be dropped."""
+        if not self._initialized:
+            self._init_handlers()
+        return self._logger.isEnabledFor(level)
+    
     def debug(self, message: str):
+        if not self._initialized:
+            self._init_handlers()
         self._logger.debug(message)
     
     def info(self, message: str):
+        if not self._initialized:
+            self._init_handlers()
         self._logger.info(message)
     
     def warning(self, message: str):
+        if not self._initialized:
+            self._init_handlers()
         self._logger.warning(message)
     
     def error(self, message: str):
+        if not self._initialized:
+            self._init_handlers()
         self._logger.error(message)
     
     def critical(self, message: str):
+        if not self._initialized:
+            self._init_handlers()
         self._logger.critical(message)
     
     def trade_signal(self, symbol: str, direction: str, score: float, price: float):
         """Log a trade signal with special formatting."""
-        msg = f"📊 SIGNAL | {symbol} | {direction} | Score: {score:.1f} | Price: {price:.5f}"
-        self._logger.info(msg)
+        if not self._initialized:
+            self._init_handlers()
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
+        self._logger.info(_SIGNAL_FMT, symbol, direction, score, price)
     
     def trade_open(self, symbol: str, direction: str, lot: float, entry: float, sl: float, zone_type: str = "", score: float = 0):
         """Log a trade opened with detailed context."""
-        msg = f"🟢 OPEN | {symbol} | {direction} | Lot: {lot} | Entry: {entry:.5f} | SL: {sl:.5f} | Zone: {zone_type} | Score: {score:.1f}"
-        self._logger.info(msg)
+        if not self._initialized:
+            self._init_handlers()
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
+        self._logger.info(_OPEN_FMT, symbol, direction, lot, entry, sl, zone_type, score)
     
     def trade_close(self, symbol: str, profit: float, pips: float, reason: str, duration_mins: float = 0):
         """Log a trade closed with detailed metrics."""
-        emoji = "✅" if profit > 0 else "❌"
-        msg = f"{emoji} CLOSE | {symbol} | P/L: ${profit:.2f} | Pips: {pips:.1f} | Duration: {duration_mins:.1f}m | Reason: {reason}"
-        self._logger.info(msg)
+        if not self._initialized:
+            self._init_handlers()
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
+        fmt = _CLOSE_WIN_FMT if profit > 0 else _CLOSE_LOSS_FMT
+        self._logger.info(fmt, symbol, profit, pips, duration_mins, reason)
     
     def risk_alert(self, message: str):
         """Log a risk management alert."""
-        msg = f"⚠️ RISK ALERT | {message}"
-        self._logger.warning(msg)
+        if not self._initialized:
+            self._init_handlers()
+        if not self._logger.isEnabledFor(logging.WARNING):
+            return
+        self._logger.warning(_RISK_FMT, message)
 
 
 def get_logger() -> IOFAELogger:
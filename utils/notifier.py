@@ -4,12 +4,116 @@ Sends trading notifications to Telegram.
 """
 
 import asyncio
-from typing import Optional
+import threading
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
-import aiohttp
+import httpx
 from enum import Enum
 
 
+# Debounced notifications are joined into one message (Telegram caps text at 4096)
+_BATCH_SEPARATOR = "\n\n━━━\n\n"
+_MAX_MESSAGE_LEN = 4096
+
+_TS_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Message templates (str.format_map with the helper's locals)
+_TRADE_OPEN_TMPL = """
+🟢 <b>INSTITUTIONAL TRADE AÇILDI</b>
+
+📊 <b>Sembol:</b> {symbol}
+📈 <b>Yön:</b> {direction}
+💰 <b>Lot:</b> {lot}
+🎯 <b>Giriş:</b> {entry_price:.5f}
+🛑 <b>Stop Loss:</b> {stop_loss:.5f}
+
+⭐ <b>Skor:</b> {score:.1f}/100
+🏷️ <b>Bölge:</b> {zone_type}
+🔗 <b>Confluence:</b> {confluence}
+
+⏰ {ts}
+"""
+
+_TRADE_CLOSE_TMPL = """
+{emoji} <b>TRADE KAPANDI</b>
+
+📊 <b>Sembol:</b> {symbol}
+📈 <b>Yön:</b> {direction}
+💰 <b>Lot:</b> {lot}
+🎯 <b>Giriş:</b> {entry_price:.5f}
+🏁 <b>Çıkış:</b> {exit_price:.5f}
+
+💵 <b>Kâr/Zarar:</b> {profit_text}
+📏 <b>Pip:</b> {pips_text}
+⏱️ <b>Süre:</b> {duration_mins:.1f} dk
+📝 <b>Sebep:</b> {reason}
+
+⏰ {ts}
+"""
+
+_SIGNAL_TMPL = """
+🔔 <b>YENİ SİNYAL</b>
+
+📊 <b>Sembol:</b> {symbol}
+📈 <b>Yön:</b> {direction}
+⭐ <b>Skor:</b> {score:.1f}/100
+🎯 <b>Hedef Seviye:</b> {target_price:.5f}
+
+⏰ {ts}
+"""
+
+_DAILY_SUMMARY_TMPL = """
+📊 <b>GÜNLÜK ÖZET - {date}</b>
+
+🔢 <b>Toplam Trade:</b> {total_trades}
+✅ <b>Kazanan:</b> {winning_trades}
+📊 <b>Win Rate:</b> {win_rate:.1f}%
+
+{profit_emoji} <b>Günlük K/Z:</b> ${total_profit:.2f}
+📏 <b>Toplam Pip:</b> {total_pips:.1f}
+
+💰 <b>Bakiye:</b> ${current_balance:.2f}
+📉 <b>Günlük DD:</b> {daily_drawdown:.2f}%
+
+⏰ {ts}
+"""
+
+_ERROR_TMPL = """
+🚨 <b>HATA</b>
+
+📍 <b>Modül:</b> {module}
+❌ <b>Hata:</b> {error_message}
+
+⏰ {ts}
+"""
+
+_RISK_ALERT_TMPL = """
+⚠️ <b>RİSK UYARISI</b>
+
+🔴 <b>Tip:</b> {alert_type}
+📝 <b>Mesaj:</b> {message}
+
+⏰ {ts}
+"""
+
+_BOT_STARTED_TMPL = """
+🚀 <b>IOFAE BOT BAŞLATILDI</b>
+
+📊 <b>Sembol:</b> {symbol}
+💰 <b>Bakiye:</b> ${balance:.2f}
+⏰ <b>Başlangıç:</b> {ts}
+
+✅ Sistemler aktif, trade bekleniyor...
+"""
+
+_BOT_STOPPED_TMPL = """
+🛑 <b>IOFAE BOT DURDURULDU</b>
+
+📝 <b>Sebep:</b> {reason}
+⏰ <b>Bitiş:</b> {ts}
+"""
+
+
 class NotificationType(Enum):
     TRADE_OPEN = "trade_open"
     TRADE_CLOSE = "trade_close"
@@ -19,8 +123,21 @@ class NotificationType(Enum):
     RISK_ALERT = "risk_alert"
 
 
+class RiskAlertType(str, Enum):
+    DAILY_LOSS = "DAILY_LOSS"
+    MAX_DRAWDOWN = "MAX_DRAWDOWN"
+
+
 class TelegramNotifier:
-    """Handles Telegram notifications for the trading bot."""
+    """
+    Handles Telegram notifications for the trading bot.
+    
+    Return values: trade open/close and signal notifications are batched,
+    so their True means "queued for the next batch" (False once the
+    notifier is closed), not delivered. Every other notify_* waits for
+    Telegram and returns True only on HTTP 200. A disabled notifier
+    returns True everywhere.
+    """
     
     def __init__(
         self,
@@ -32,6 +149,47 @@ class TelegramNotifier:
         self.chat_id = chat_id
         self.enabled = enabled
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        
+        # Dedicated event loop thread: every send (sync or batched) runs here,
+        # so the keep-alive client always belongs to the same loop.
+        # A disabled notifier sends nothing, so it gets neither.
+        self.send_timeout_s = 10.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        if self.enabled:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever, name="TelegramNotifier", daemon=True
+            )
+            self._loop_thread.start()
+            
+            # One keep-alive HTTP/2 client for all sends (outbound only, one pool)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+                timeout=self.send_timeout_s
+            )
+        
+        # Trade/signal notifications arriving within batch_window_s are sent
+        # as one message, rendered at flush with one shared timestamp
+        # (loop thread only, so no lock)
+        self.batch_window_s = 0.05
+        self._pending: List[Tuple[str, Dict]] = []
+        self._flush_task: Optional[asyncio.Task] = None   # still sleeping
+        self._flushing: Set[asyncio.Task] = set()         # past the sleep, sending
+    
+    async def close(self):
+        """Send anything still queued, then close the HTTP client."""
+        # A sleeping flush has not taken its batch yet, so cancelling it is
+        # safe; one already sending owns its batch and must finish
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+        await self._flush_pending()
+        await self._client.aclose()
     
     async def _send_message(self, text: str, parse_mode: str = "HTML") -> bool:
         """Send a message to Telegram."""
@@ -39,29 +197,85 @@ class TelegramNotifier:
             return True
         
         try:
-            url = f"{self.base_url}/sendMessage"
             payload = {
                 "chat_id": self.chat_id,
                 "text": text,
                 "parse_mode": parse_mode
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    return response.status == 200
+            response = await self._client.post("/sendMessage", json=payload)
+            return response.status_code == 200
+        except Exception as e:
+            print(f"Telegram notification error: {e}")
+            return False
+    
+    def _run_sync(self, coro) -> bool:
+        """Run a coroutine on the notifier loop and wait for its result."""
+        if self._loop is None or not self._loop.is_running():
+            coro.close()
+            return False
+        try:
+            return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout=self.send_timeout_s)
         except Exception as e:
             print(f"Telegram notification error: {e}")
             return False
     
     def send_message_sync(self, text: str, parse_mode: str = "HTML") -> bool:
         """Synchronous wrapper for sending messages."""
+        if not self.enabled:
+            return True
+        return self._run_sync(self._send_message(text, parse_mode))
+    
+    def _queue_message(self, template: str, fields: Dict) -> bool:
+        """Queue a template + fields for the next batch; True once queued."""
+        if not self.enabled:
+            return True
+        if not self._loop.is_running():
+            return False
+        self._loop.call_soon_threadsafe(self._enqueue, template, fields)
+        return True
+    
+    def _enqueue(self, template: str, fields: Dict):
+        self._pending.append((template, fields))
+        if self._flush_task is None:
+            self._flush_task = self._loop.create_task(self._flush_after(self.batch_window_s))
+    
+    async def _flush_after(self, delay: float):
+        await asyncio.sleep(delay)
+        task = asyncio.current_task()
+        self._flushing.add(task)   # _flush_pending clears _flush_task in the same step
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            await self._flush_pending()
+        finally:
+            self._flushing.discard(task)
+    
+    async def _flush_pending(self) -> bool:
+        """Send queued messages, packed into as few 4096-char messages as possible."""
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+        
+        ts = datetime.now().strftime(_TS_FORMAT)
+        chunks: List[str] = []
+        for template, fields in batch:
+            text = template.format_map({**fields, 'ts': fields['ts'] or ts}).strip()
+            if chunks and len(chunks[-1]) + len(_BATCH_SEPARATOR) + len(text) <= _MAX_MESSAGE_LEN:
+                chunks[-1] += _BATCH_SEPARATOR + text
+            else:
+                chunks.append(text)
         
-        return loop.run_until_complete(self._send_message(text, parse_mode))
+        ok = True
+        for chunk in chunks:
+            ok = await self._send_message(chunk) and ok
+        return ok
+    
+    def close_sync(self):
+        """Synchronous wrapper for close(); also stops the loop thread."""
+        if self._loop is None:
+            return
+        self._run_sync(self.close())
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=self.send_timeout_s)
     
     def notify_trade_open(
         self,
@@ -72,25 +286,12 @@ class TelegramNotifier:
         stop_loss: float,
         score: float,
         zone_type: str = "Unknown",
-        confluence: str = ""
+        confluence: str = "",
+        ts: Optional[str] = None
     ) -> bool:
-        """Notify about a new trade opened with detailed institutional context."""
-        text = f"""
-🟢 <b>INSTITUTIONAL TRADE AÇILDI</b>
-
-📊 <b>Sembol:</b> {symbol}
-📈 <b>Yön:</b> {direction}
-💰 <b>Lot:</b> {lot}
-🎯 <b>Giriş:</b> {entry_price:.5f}
-🛑 <b>Stop Loss:</b> {stop_loss:.5f}
-
-⭐ <b>Skor:</b> {score:.1f}/100
-🏷️ <b>Bölge:</b> {zone_type}
-🔗 <b>Confluence:</b> {confluence if confluence else 'Standart'}
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        return self.send_message_sync(text)
+        """Notify about a new trade opened with detailed institutional context (batched: True = queued)."""
+        confluence = confluence or 'Standart'
+        return self._queue_message(_TRADE_OPEN_TMPL, locals())
     
     def notify_trade_close(
         self,
@@ -102,50 +303,26 @@ class TelegramNotifier:
         profit: float,
         pips: float,
         reason: str,
-        duration_mins: float = 0
+        duration_mins: float = 0,
+        ts: Optional[str] = None
     ) -> bool:
-        """Notify about a trade closed with detailed performance metrics."""
+        """Notify about a trade closed with detailed performance metrics (batched: True = queued)."""
         emoji = "✅" if profit > 0 else "❌"
         profit_text = f"+${profit:.2f}" if profit > 0 else f"-${abs(profit):.2f}"
         pips_text = f"+{pips:.1f}" if pips > 0 else f"{pips:.1f}"
         
-        text = f"""
-{emoji} <b>TRADE KAPANDI</b>
-
-📊 <b>Sembol:</b> {symbol}
-📈 <b>Yön:</b> {direction}
-💰 <b>Lot:</b> {lot}
-🎯 <b>Giriş:</b> {entry_price:.5f}
-🏁 <b>Çıkış:</b> {exit_price:.5f}
-
-💵 <b>Kâr/Zarar:</b> {profit_text}
-📏 <b>Pip:</b> {pips_text}
-⏱️ <b>Süre:</b> {duration_mins:.1f} dk
-📝 <b>Sebep:</b> {reason}
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        return self.send_message_sync(text)
+        return self._queue_message(_TRADE_CLOSE_TMPL, locals())
     
     def notify_signal(
         self,
         symbol: str,
         direction: str,
         score: float,
-        target_price: float
+        target_price: float,
+        ts: Optional[str] = None
     ) -> bool:
-        """Notify about a trading signal."""
-        text = f"""
-🔔 <b>YENİ SİNYAL</b>
-
-📊 <b>Sembol:</b> {symbol}
-📈 <b>Yön:</b> {direction}
-⭐ <b>Skor:</b> {score:.1f}/100
-🎯 <b>Hedef Seviye:</b> {target_price:.5f}
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
-        return self.send_message_sync(text)
+        """Notify about a trading signal (batched: True = queued)."""
+        return self._queue_message(_SIGNAL_TMPL, locals())
     
     def notify_daily_summary(
         self,
@@ -155,74 +332,40 @@ class TelegramNotifier:
         total_profit: float,
         total_pips: float,
         current_balance: float,
-        daily_drawdown: float
+        daily_drawdown: float,
+        ts: Optional[str] = None
     ) -> bool:
         """Send daily trading summary."""
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
         profit_emoji = "📈" if total_profit > 0 else "📉"
         
-        text = f"""
-📊 <b>GÜNLÜK ÖZET - {date}</b>
-
-🔢 <b>Toplam Trade:</b> {total_trades}
-✅ <b>Kazanan:</b> {winning_trades}
-📊 <b>Win Rate:</b> {win_rate:.1f}%
-
-{profit_emoji} <b>Günlük K/Z:</b> ${total_profit:.2f}
-📏 <b>Toplam Pip:</b> {total_pips:.1f}
-
-💰 <b>Bakiye:</b> ${current_balance:.2f}
-📉 <b>Günlük DD:</b> {daily_drawdown:.2f}%
-
-⏰ {datetime.now().strftime('%H:%M:%S')}
-"""
+        ts = ts or datetime.now().strftime('%H:%M:%S')
+        text = _DAILY_SUMMARY_TMPL.format_map(locals())
         return self.send_message_sync(text)
     
-    def notify_error(self, error_message: str, module: str = "Unknown") -> bool:
+    def notify_error(self, error_message: str, module: str = "Unknown", ts: Optional[str] = None) -> bool:
         """Notify about an error."""
-        text = f"""
-🚨 <b>HATA</b>
-
-📍 <b>Modül:</b> {module}
-❌ <b>Hata:</b> {error_message}
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
+        ts = ts or datetime.now().strftime(_TS_FORMAT)
+        text = _ERROR_TMPL.format_map(locals())
         return self.send_message_sync(text)
     
-    def notify_risk_alert(self, alert_type: str, message: str) -> bool:
+    def notify_risk_alert(self, alert_type: RiskAlertType, message: str, ts: Optional[str] = None) -> bool:
         """Notify about a risk management alert."""
-        text = f"""
-⚠️ <b>RİSK UYARISI</b>
-
-🔴 <b>Tip:</b> {alert_type}
-📝 <b>Mesaj:</b> {message}
-
-⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
+        alert_type = getattr(alert_type, 'value', alert_type)
+        ts = ts or datetime.now().strftime(_TS_FORMAT)
+        text = _RISK_ALERT_TMPL.format_map(locals())
         return self.send_message_sync(text)
     
-    def notify_bot_started(self, symbol: str, balance: float) -> bool:
+    def notify_bot_started(self, symbol: str, balance: float, ts: Optional[str] = None) -> bool:
         """Notify that the bot has started."""
-        text = f"""
-🚀 <b>IOFAE BOT BAŞLATILDI</b>
-
-📊 <b>Sembol:</b> {symbol}
-💰 <b>Bakiye:</b> ${balance:.2f}
-⏰ <b>Başlangıç:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-✅ Sistemler aktif, trade bekleniyor...
-"""
+        ts = ts or datetime.now().strftime(_TS_FORMAT)
+        text = _BOT_STARTED_TMPL.format_map(locals())
         return self.send_message_sync(text)
     
-    def notify_bot_stopped(self, reason: str = "Manual stop") -> bool:
+    def notify_bot_stopped(self, reason: str = "Manual stop", ts: Optional[str] = None) -> bool:
         """Notify that the bot has stopped."""
-        text = f"""
-🛑 <b>IOFAE BOT DURDURULDU</b>
-
-📝 <b>Sebep:</b> {reason}
-⏰ <b>Bitiş:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-"""
+        ts = ts or datetime.now().strftime(_TS_FORMAT)
+        text = _BOT_STOPPED_TMPL.format_map(locals())
         return self.send_message_sync(text)
 
 